@@ -54,27 +54,133 @@
 #  All assignments of COLOR follow clockwise from TOP down with RED as 0, 1200, or 2400 (top of the clock, aka High Noon)
 #
 
+import array
+import concurrent.futures
 import copy
 import random
-import inspect
-
-class Meta(type):
-  def __repr__(self):
-    # Inspiration: https://stackoverflow.com/a/6811020
-    callerframerecord = inspect.stack()[1]  # 0 represents this line
-    # 1 represents line at caller
-    frame = callerframerecord[0]
-    info = inspect.getframeinfo(frame)
-    # print(info.filename)  # __FILE__     -> Test.py
-    # print(info.function)  # __FUNCTION__ -> Main
-    # print(info.lineno)  # __LINE__     -> 13
-    return str(info.lineno)
-
-class __LINE__(metaclass=Meta):
-  pass
+import io
+import json
+import math
+import mmap
+import multiprocessing
+import sys
+import tempfile
+import threading
+import time
+
+#
+# Logging.
+#
+# Messages are formatted only when their level is on, so a disabled message costs one comparison.
+# Per-move events go through Sampled(), which emits one in every 'sample' calls, so the log volume
+# stays flat whatever the move rate.  The caller's file and line are read from its frame only when
+# a message is written.
+#
+
+LOG_ERROR = 0
+LOG_WARNING = 1
+LOG_INFO = 2
+LOG_DEBUG = 3
+
+LOG_NAMES = [ "ERROR", "WARNING", "INFO", "DEBUG" ]
+
+LOG_LEVEL = LOG_WARNING
+LOG_SAMPLE = 1000
+
+class RubicsLog:
+
+  def __init__( self, level_P = LOG_LEVEL, sample_P = LOG_SAMPLE, stream_P = None ) :
+    self._level = level_P
+    self._sample = sample_P
+    self._stream = stream_P
+    self._count = 0
+    self._lock = threading.Lock()
+
+  def SetLevel( self, level_P ) :
+    self._level = level_P
+
+  def SetSample( self, sample_P ) :
+    self._sample = sample_P
+
+  def Enabled( self, level_P ) :
+    return level_P <= self._level
+
+  def Log( self, level_P, msg_P, *args_P ) :
+    if level_P <= self._level :
+      self._emit( level_P, msg_P, args_P )
+
+  def Sampled( self, level_P, msg_P, *args_P ) :
+    if level_P <= self._level :
+      # threads never lose or repeat a tick, with or without the GIL
+      with self._lock :
+        self._count += 1
+        tick = self._count
+
+      if tick % self._sample == 0 :
+        self._emit( level_P, msg_P, args_P )
 
-def __FILE__():
-  return inspect.currentframe().f_code.co_filename
+  def Error( self, msg_P, *args_P ) :
+    self._emit( LOG_ERROR, msg_P, args_P )
+
+  def _emit( self, level_P, msg_P, args_P ) :
+    # 0 is _emit, 1 is Log/Sampled/Error, 2 is the caller
+    frame = sys._getframe( 2 )
+
+    text = msg_P
+    if args_P :
+      text = msg_P % args_P
+
+    stream = self._stream
+    if stream == None :
+      stream = sys.stdout
+
+    stream.write( "%s %s @ %d %s: %s\n" % ( LOG_NAMES[ level_P ], frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name, text ))
+
+LOG = RubicsLog()
+
+class _LogArg:
+  # counts how often it is formatted
+  def __init__( self ) :
+    self._formatted = 0
+
+  def __str__( self ) :
+    self._formatted += 1
+    return "arg"
+
+def TestLog() :
+  # levels, formatting only when written, one in 'sample' and the caller's frame, against known lines
+  failures = 0
+  stream = io.StringIO()
+  log = RubicsLog( LOG_WARNING, 3, stream )
+  arg = _LogArg()
+
+  log.Log( LOG_INFO, "hidden %s", arg )
+  log.Log( LOG_DEBUG, "hidden %s", arg )
+  line = sys._getframe().f_lineno + 1
+  log.Log( LOG_WARNING, "shown %s %d", arg, 7 )
+  expected = [ "WARNING %s @ %d TestLog: shown arg 7" % ( __file__, line ) ]
+
+  # the count starts at 1 and only calls at an enabled level count, every third is written
+  line = sys._getframe().f_lineno + 2
+  for i in range( 0, 10 ) :
+    log.Sampled( LOG_WARNING, "tick %d", i )
+    log.Sampled( LOG_DEBUG, "hidden tick %d", i )
+
+  expected += [ "WARNING %s @ %d TestLog: tick %d" % ( __file__, line, i ) for i in ( 2, 5, 8 ) ]
+
+  log.SetLevel( LOG_ERROR )
+  line = sys._getframe().f_lineno + 1
+  log.Error( "always" )
+  log.Log( LOG_WARNING, "hidden now" )
+  expected.append( "ERROR %s @ %d TestLog: always" % ( __file__, line ))
+
+  found = stream.getvalue().split( "\n" )[ : -1 ]
+  if found != expected or arg._formatted != 1 or log.Enabled( LOG_WARNING ) or not log.Enabled( LOG_ERROR ) :
+    print( "\tLOG MISMATCH ****************** formatted %d times, lines %s" % ( arg._formatted, found ))
+    failures += 1
+
+  print( "Log: %d lines, %d mismatches" % ( len( found ), failures ))
+  assert failures == 0
 
 DEBUG_ROTATE_LABELS = 0
 DEBUG_ROTATE = 0
@@ -97,6 +203,44 @@ TEST_ROTATE_NO_BLUE = 1
 TEST_ROTATE_RANDOM_ITERATIONS_1 = 100
 TEST_ROTATE_RANDOM_ITERATIONS_2 = 100
 
+TEST_RANDOM_STATE = 0
+TEST_RANDOM_STATE_COUNT = 100000
+
+TEST_LOG = 1
+
+TEST_RENDER = 1
+
+TEST_FACE_VIEW = 1
+
+TEST_ALGORITHM = 1
+TEST_ALGORITHM_COUNT = 100
+TEST_ALGORITHM_LENGTH = 10
+
+TEST_ZOBRIST = 1
+TEST_ZOBRIST_MOVES = 10000
+
+TEST_FACELETS = 1
+TEST_FACELETS_COUNT = 1000
+
+TEST_PEEPHOLE = 1
+TEST_PEEPHOLE_COUNT = 300
+
+TEST_FUZZ = 0
+
+TEST_THREADS = 0
+
+TEST_MIXING = 0
+TEST_MIXING_CHECK = 1
+
+TEST_STREAM = 0
+TEST_STREAM_MOVES = 100000
+
+TEST_POCKET = 0
+
+TEST_SOLVE = 0
+TEST_SOLVE_SCRAMBLE = 8
+TEST_SOLVE_DEADLINES = [ 0.01, 0.1, 1.0, 10.0 ]
+
 PRINT_SIDE_LABEL = 1
 
 CUBE_CUBE = 0
@@ -148,16 +292,107 @@ CUBE_CORNER_FACE_2 = 6
 
 CUBE_NIL = [ CUBE_NULL, CUBE_NULL, CUBE_NULL, CUBE_NULL, CUBE_NULL, CUBE_NULL, CUBE_NULL, CUBE_NULL ]
 
-class RubicsCube:
+#
+# Read-only views.
+#
+# A view keeps the cube and the ( layer, slot ) of every piece on one face and reads through to
+# the cube's layers on every access, so it costs nothing to make and always shows the cube as it
+# is now.  RubicsFaceView reads one field of a piece with Field( side_index, field ) and hands out
+# the 8 pieces of a face by side index as RubicsPieceView, which reads the fields the same way and
+# has no way to write them.  Neither copies a piece.  RubicsStickerView hands out the 9 colors of a face in PrintSide
+# order: 1030 0000 0130 / 0900 center 0300 / 0730 0600 0430.
+#
+
+class RubicsPieceView:
+
+  def __init__( self, layers_P, layer_P, slot_P ) :
+    self._layers = layers_P
+    self._layer = layer_P
+    self._slot = slot_P
+
+  def __len__( self ) :
+    return len( self._layers[ self._layer ][ self._slot ] )
+
+  def __getitem__( self, field_P ) :
+    return self._layers[ self._layer ][ self._slot ][ field_P ]
+
+  def __iter__( self ) :
+    return iter( self._layers[ self._layer ][ self._slot ] )
+
+  def __repr__( self ) :
+    return repr( self._layers[ self._layer ][ self._slot ] )
+
+class RubicsFaceView:
+
+  def __init__( self, cube_P, side_id_P ) :
+    self._cube = cube_P
+    self._side_id = side_id_P
+    self._slots = RubicsCube._SIDE_SLOTS[ side_id_P ]
+
+  def __len__( self ) :
+    return CUBE_SIDE_COUNT
+
+  def __getitem__( self, side_index_P ) :
+    layer, slot = self._slots[ side_index_P ]
+    return RubicsPieceView( self._cube._cube, layer, slot )
+
+  def __iter__( self ) :
+    layers = self._cube._cube
+    for layer, slot in self._slots :
+      yield RubicsPieceView( layers, layer, slot )
+
+  def __repr__( self ) :
+    return repr( [ list( piece ) for piece in self ] )
+
+  def SideId( self ) :
+    return self._side_id
+
+  def Field( self, side_index_P, field_P ) :
+    layer, slot = self._slots[ side_index_P ]
+    return self._cube._cube[ layer ][ slot ][ field_P ]
+
+  def Color( self, side_index_P ) :
+    # the color this face shows on the piece, corners sit at the odd side indexes.  The piece is
+    # read in its layer, where slot is its index
+    layer, slot = self._slots[ side_index_P ]
+    if side_index_P & 1 :
+      return self._cube._side_corner_color_get( self._side_id, self._cube._cube[ layer ], slot )
+
+    return self._cube._side_edge_color_get( self._side_id, self._cube._cube[ layer ], slot )
+
+  def Stickers( self ) :
+    return RubicsStickerView( self )
+
+class RubicsStickerView:
+
+  # PrintSide cell -> side index, None for the center
+  _CELLS = ( 7, 0, 1, 6, None, 2, 5, 4, 3 )
+
+  def __init__( self, face_P ) :
+    self._face = face_P
+
+  def __len__( self ) :
+    return len( RubicsStickerView._CELLS )
+
+  def __getitem__( self, cell_P ) :
+    side_index = RubicsStickerView._CELLS[ cell_P ]
+    if side_index == None :
+      return self._face._side_id
+
+    return self._face.Color( side_index )
 
-  _1030 = CUBE_NIL
-  _0000 = CUBE_NIL
-  _0130 = CUBE_NIL
-  _0300 = CUBE_NIL
-  _0430 = CUBE_NIL
-  _0600 = CUBE_NIL
-  _0730 = CUBE_NIL
-  _0900 = CUBE_NIL
+  def __iter__( self ) :
+    for cell in range( 0, len( RubicsStickerView._CELLS )) :
+      yield self[ cell ]
+
+  def __repr__( self ) :
+    return repr( list( self ))
+
+  def Rows( self ) :
+    colors = list( self )
+    return [ colors[ 0 : 3 ], colors[ 3 : 6 ], colors[ 6 : 9 ] ]
+
+class RubicsCube:
 
   _SIDE_RED_OFFSET = 0
   _SIDE_GREEN_OFFSET = 2
@@ -244,6 +479,7 @@ class RubicsCube:
   _SIDE_BLUE = [ _SIDE_BLUE_0000_T, _SIDE_BLUE_0130_T, _SIDE_BLUE_0300_M, _SIDE_BLUE_0430_B, _SIDE_BLUE_0600_B, _SIDE_BLUE_0730_B, _SIDE_BLUE_0900_M, _SIDE_BLUE_1030_T ]
 
   _SIDE_INDEX = [ 0, _SIDE_WHITE, _SIDE_YELLOW, _SIDE_RED, _SIDE_GREEN, _SIDE_ORANGE, _SIDE_BLUE ]
+  _SIDE_SLOTS = None    # side_id -> side index -> ( layer, slot ), filled in below the class
 
   _CUBE_WR = [ CUBE_EDGE, CUBE_WHITE, CUBE_RED, CUBE_WHITE, CUBE_RED, CUBE_ID_SPACER, CUBE_ID_SPACER ]
   _CUBE_WG = [ CUBE_EDGE, CUBE_WHITE, CUBE_GREEN, CUBE_WHITE, CUBE_GREEN, CUBE_ID_SPACER, CUBE_ID_SPACER ]
@@ -281,47 +517,25 @@ class RubicsCube:
 
   _CUBE_NIL = CUBE_NIL
 
-  _cube = [ CUBE_NIL, CUBE_NIL, CUBE_NIL ]
-  _cube_solved = [ CUBE_NIL, CUBE_NIL, CUBE_NIL ]
+  # tables above are shared and never written, all state lives in the instance
+  _hash = None
+  _history = None
 
   def __init__( self ) :
     bot = [ RubicsCube._CUBE_YR, RubicsCube._CUBE_YGR, RubicsCube._CUBE_YG, RubicsCube._CUBE_YOG, RubicsCube._CUBE_YO, RubicsCube._CUBE_YBO, RubicsCube._CUBE_YB, RubicsCube._CUBE_YRB ]
     mid = [ RubicsCube._CUBE_RED, RubicsCube._CUBE_RGM, RubicsCube._CUBE_GED, RubicsCube._CUBE_GOM, RubicsCube._CUBE_OED, RubicsCube._CUBE_OBM, RubicsCube._CUBE_BED, RubicsCube._CUBE_BRM ] 
     top    = [ RubicsCube._CUBE_WR, RubicsCube._CUBE_WRG, RubicsCube._CUBE_WG, RubicsCube._CUBE_WGO, RubicsCube._CUBE_WO, RubicsCube._CUBE_WOB, RubicsCube._CUBE_WB, RubicsCube._CUBE_WBR ] 
 
+    self._cube = [ CUBE_NIL, CUBE_NIL, CUBE_NIL ]
     self._cube[ CUBE_TOP ] = copy.deepcopy( top )
     self._cube[ CUBE_MIDDLE ] = copy.deepcopy( mid )
     self._cube[ CUBE_BOTTOM ] = copy.deepcopy( bot )
 
     self._cube_solved = copy.deepcopy( self._cube )
 
-  def _side_get( self, side_id_P ) :
-    top = self._cube[ CUBE_TOP ]
-    mid = self._cube[ CUBE_MIDDLE ]
-    bot = self._cube[ CUBE_BOTTOM ]
-
-    side = [ CUBE_NIL, CUBE_NIL, CUBE_NIL, CUBE_NIL, CUBE_NIL, CUBE_NIL, CUBE_NIL, CUBE_NIL ]
-
-    if side_id_P == CUBE_WHITE :
-      mid = top
-      bot = top
-
-    elif side_id_P == CUBE_YELLOW :
-      top = bot
-      mid = bot
-
-    side[ RubicsCube._SIDE_INDEX_0000 ] = copy.deepcopy( top[ RubicsCube._SIDE_INDEX[ side_id_P ][RubicsCube._SIDE_INDEX_0000 ]] )
-    side[ RubicsCube._SIDE_INDEX_0130 ] = copy.deepcopy( top[ RubicsCube._SIDE_INDEX[ side_id_P ][RubicsCube._SIDE_INDEX_0130 ]] )
-    side[ RubicsCube._SIDE_INDEX_0300 ] = copy.deepcopy( mid[ RubicsCube._SIDE_INDEX[ side_id_P ][RubicsCube._SIDE_INDEX_0300 ]] )
-    side[ RubicsCube._SIDE_INDEX_0430 ] = copy.deepcopy( bot[ RubicsCube._SIDE_INDEX[ side_id_P ][RubicsCube._SIDE_INDEX_0430 ]] )
-    side[ RubicsCube._SIDE_INDEX_0600 ] = copy.deepcopy( bot[ RubicsCube._SIDE_INDEX[ side_id_P ][RubicsCube._SIDE_INDEX_0600 ]] )
-    side[ RubicsCube._SIDE_INDEX_0730 ] = copy.deepcopy( bot[ RubicsCube._SIDE_INDEX[ side_id_P ][RubicsCube._SIDE_INDEX_0730 ]] )
-    side[ RubicsCube._SIDE_INDEX_0900 ] = copy.deepcopy( mid[ RubicsCube._SIDE_INDEX[ side_id_P ][RubicsCube._SIDE_INDEX_0900 ]] )
-    side[ RubicsCube._SIDE_INDEX_1030 ] = copy.deepcopy( top[ RubicsCube._SIDE_INDEX[ side_id_P ][RubicsCube._SIDE_INDEX_1030 ]] )
-    
-    return side
-
-  def _side_put( self, side_id_P, side_P ) :
+  @staticmethod
+  def _side_slots_build( side_id_P ) :
+    # side index -> ( layer, slot ) of the piece, WHITE and YELLOW lie in one layer
     top_id = CUBE_TOP
     mid_id = CUBE_MIDDLE
     bot_id = CUBE_BOTTOM
@@ -330,18 +544,40 @@ class RubicsCube:
       mid_id = CUBE_TOP
       bot_id = CUBE_TOP
 
-    if side_id_P == CUBE_YELLOW :
+    elif side_id_P == CUBE_YELLOW :
       top_id = CUBE_BOTTOM
       mid_id = CUBE_BOTTOM
 
-    self._cube[ top_id ][ RubicsCube._SIDE_INDEX[ side_id_P ][ RubicsCube._SIDE_INDEX_0000 ]] = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0000 ] )
-    self._cube[ top_id ][ RubicsCube._SIDE_INDEX[ side_id_P ][ RubicsCube._SIDE_INDEX_0130 ]] = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0130 ] )
-    self._cube[ mid_id ][ RubicsCube._SIDE_INDEX[ side_id_P ][ RubicsCube._SIDE_INDEX_0300 ]] = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0300 ] )
-    self._cube[ bot_id ][ RubicsCube._SIDE_INDEX[ side_id_P ][ RubicsCube._SIDE_INDEX_0430 ]] = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0430 ] )
-    self._cube[ bot_id ][ RubicsCube._SIDE_INDEX[ side_id_P ][ RubicsCube._SIDE_INDEX_0600 ]] = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0600 ] )
-    self._cube[ bot_id ][ RubicsCube._SIDE_INDEX[ side_id_P ][ RubicsCube._SIDE_INDEX_0730 ]] = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0730 ] )
-    self._cube[ mid_id ][ RubicsCube._SIDE_INDEX[ side_id_P ][ RubicsCube._SIDE_INDEX_0900 ]] = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0900 ] )
-    self._cube[ top_id ][ RubicsCube._SIDE_INDEX[ side_id_P ][ RubicsCube._SIDE_INDEX_1030 ]] = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_1030 ] )
+    index = RubicsCube._SIDE_INDEX[ side_id_P ]
+    return ( ( top_id, index[ RubicsCube._SIDE_INDEX_0000 ] ),
+             ( top_id, index[ RubicsCube._SIDE_INDEX_0130 ] ),
+             ( mid_id, index[ RubicsCube._SIDE_INDEX_0300 ] ),
+             ( bot_id, index[ RubicsCube._SIDE_INDEX_0430 ] ),
+             ( bot_id, index[ RubicsCube._SIDE_INDEX_0600 ] ),
+             ( bot_id, index[ RubicsCube._SIDE_INDEX_0730 ] ),
+             ( mid_id, index[ RubicsCube._SIDE_INDEX_0900 ] ),
+             ( top_id, index[ RubicsCube._SIDE_INDEX_1030 ] ))
+
+  def _side_get( self, side_id_P ) :
+    # a read-only view, nothing is copied
+    return RubicsFaceView( self, side_id_P )
+
+  def _side_pieces( self, side_id_P ) :
+    # the face's own pieces by side index, for the rotation to move and relabel in place
+    return [ self._cube[ layer ][ slot ] for layer, slot in RubicsCube._SIDE_SLOTS[ side_id_P ]]
+
+  def _side_put( self, side_id_P, side_P ) :
+    # only the 8 slots of the face are written
+    i = 0
+    for layer, slot in RubicsCube._SIDE_SLOTS[ side_id_P ] :
+      self._cube[ layer ][ slot ] = side_P[ i ]
+      i += 1
+
+  def Face( self, side_id_P ) :
+    return RubicsFaceView( self, side_id_P )
+
+  def FaceStickers( self, side_id_P ) :
+    return RubicsStickerView( RubicsFaceView( self, side_id_P ))
 
   def _side_edge_color_get( self, side_id_P, side_P, side_index_P ) :
     if side_id_P == side_P[ side_index_P ][ CUBE_EDGE_FACE_0 ] :
@@ -351,7 +587,7 @@ class RubicsCube:
       return side_P[ side_index_P ][ CUBE_EDGE_1 ]
 
     else :
-      print( "illegal edge face", side_id_P, __FILE__(), "@", __LINE__ )
+      LOG.Error( "illegal edge face %d", side_id_P )
       exit()
 
   def _side_corner_color_get( self, side_id_P, side_P, side_index_P ) :
@@ -365,7 +601,7 @@ class RubicsCube:
       return side_P[ side_index_P ][ CUBE_CORNER_2 ]
 
     else :
-      print( "illegal corner face", side_id_P, __FILE__(), "@", __LINE__ )
+      LOG.Error( "illegal corner face %d", side_id_P )
       exit()
 
   def _side_edge_white( self, direction_P, face_color_P ) :
@@ -383,7 +619,7 @@ class RubicsCube:
         return CUBE_RED
 
       else :
-        print( "illegal face", __FILE__(), "@", __LINE__ )
+        LOG.Error( "illegal face %d", face_color_P )
         exit()
 
     else :
@@ -400,7 +636,7 @@ class RubicsCube:
         return CUBE_RED
 
       else :
-        print( "illegal face", __FILE__(), "@", __LINE__ )
+        LOG.Error( "illegal face %d", face_color_P )
         exit()
 
   def _side_edge_yellow( self, direction_P, face_color_P ) :
@@ -414,7 +650,7 @@ class RubicsCube:
     return self._side_edge_white( direction, face_color_P )
 
   def _side_edge_red( self, direction_P, face_color_P ) :
-    print( "_side_edge_red", direction_P, face_color_P )
+    LOG.Sampled( LOG_DEBUG, "_side_edge_red %d %d", direction_P, face_color_P )
     if direction_P == ROTATE_CLOCKWISE :
       if face_color_P == CUBE_WHITE :
         return CUBE_BLUE
@@ -429,7 +665,7 @@ class RubicsCube:
         return CUBE_WHITE
 
       else :
-        print( "illegal face", face_color_P, __FILE__(), "@", __LINE__ )
+        LOG.Error( "illegal face %d", face_color_P )
         exit()
 
     else :
@@ -446,7 +682,7 @@ class RubicsCube:
         return CUBE_WHITE
 
       else :
-        print( "illegal face", face_color_P, __FILE__(), "@", __LINE__ )
+        LOG.Error( "illegal face %d", face_color_P )
         exit()
 
   def _side_edge_orange( self, direction_P, face_color_P ) :
@@ -474,7 +710,7 @@ class RubicsCube:
         return CUBE_WHITE
 
       else :
-        print( "illegal face", __FILE__(), "@", __LINE__ )
+        LOG.Error( "illegal face %d", face_color_P )
         exit()
 
     else :
@@ -491,7 +727,7 @@ class RubicsCube:
         return CUBE_WHITE
 
       else :
-        print( "illegal face", __FILE__(), "@", __LINE__ )
+        LOG.Error( "illegal face %d", face_color_P )
         exit()
 
   def _side_edge_blue( self, direction_P, face_color_P ) :
@@ -524,18 +760,19 @@ class RubicsCube:
       return self._side_edge_blue( direction_P, face_color_P )
 
     else :
-      print( "illegal side", "d", direction_P, "s", side_id_P, "f", face_color_P, __FILE__(), "@", __LINE__ )
+      LOG.Error( "illegal side d %d s %d f %d", direction_P, side_id_P, face_color_P )
       exit()
 
-  def _side_deepcopy( self, side_P ) :
-    self._1030 = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_1030 ] )
-    self._0000 = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0000 ] )
-    self._0130 = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0130 ] )
-    self._0300 = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0300 ] )
-    self._0430 = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0430 ] )
-    self._0600 = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0600 ] )
-    self._0730 = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0730 ] )
-    self._0900 = copy.deepcopy( side_P[ RubicsCube._SIDE_INDEX_0900 ] )
+  def _side_unpack( self, side_P ) :
+    # the 8 pieces in the order 1030 0000 0130 0300 0430 0600 0730 0900
+    return ( side_P[ RubicsCube._SIDE_INDEX_1030 ],
+             side_P[ RubicsCube._SIDE_INDEX_0000 ],
+             side_P[ RubicsCube._SIDE_INDEX_0130 ],
+             side_P[ RubicsCube._SIDE_INDEX_0300 ],
+             side_P[ RubicsCube._SIDE_INDEX_0430 ],
+             side_P[ RubicsCube._SIDE_INDEX_0600 ],
+             side_P[ RubicsCube._SIDE_INDEX_0730 ],
+             side_P[ RubicsCube._SIDE_INDEX_0900 ] )
 
   def _rotate_face_edge_plus_cube_delay( self, cell_P, edge_P, edge_cell_P, edge_face_P ) :
     if cell_P[ CUBE_CORNER_FACE_0 ] == edge_P :
@@ -552,7 +789,7 @@ class RubicsCube:
       print( "\n\tcorner left", corner_left_P, "0000 middle", edge_P, "corner right", corner_right_P )
 
     if edge_P[ CUBE_EDGE_FACE_0 ] == side_id_P :
-      edge = copy.deepcopy( edge_P[ CUBE_EDGE_FACE_1 ] )
+      edge = edge_P[ CUBE_EDGE_FACE_1 ]
       edge_P[ CUBE_EDGE_FACE_1 ] = self._side_edge_face_get( direction_P, side_id_P, edge_P[ CUBE_EDGE_FACE_1 ] )
 
       if( DEBUG_ROTATE_FACES == 1 ) :
@@ -562,7 +799,7 @@ class RubicsCube:
       self._rotate_face_edge_plus_cube_delay( corner_right_P, edge, edge_P, CUBE_EDGE_FACE_1 )
 
     elif edge_P[ CUBE_EDGE_FACE_1 ] == side_id_P :
-      edge = copy.deepcopy( edge_P[ CUBE_EDGE_FACE_0 ] )
+      edge = edge_P[ CUBE_EDGE_FACE_0 ]
       edge_P[ CUBE_EDGE_FACE_0 ] = self._side_edge_face_get( direction_P, side_id_P, edge_P[ CUBE_EDGE_FACE_0 ] )
 
       if( DEBUG_ROTATE_FACES == 1 ) :
@@ -595,30 +832,30 @@ class RubicsCube:
     side_P[ RubicsCube._SIDE_INDEX_1030 ] = _1030_P
 
   def _rotate_faces( self, direction_P, side_id_P, side_P ) :
-    self._side_deepcopy( side_P )
+    _1030, _0000, _0130, _0300, _0430, _0600, _0730, _0900 = self._side_unpack( side_P )
 
     edge = 0
     
   # 0000 EDGE
-    self._rotate_face_edge( side_id_P, direction_P, self._1030, self._0000, self._0130 )
+    self._rotate_face_edge( side_id_P, direction_P, _1030, _0000, _0130 )
   # 0300 EDGE
-    self._rotate_face_edge( side_id_P, direction_P, self._0130, self._0300, self._0430 )
+    self._rotate_face_edge( side_id_P, direction_P, _0130, _0300, _0430 )
   # 0600 EDGE
-    self._rotate_face_edge( side_id_P, direction_P, self._0430, self._0600, self._0730 )
+    self._rotate_face_edge( side_id_P, direction_P, _0430, _0600, _0730 )
   # 0900 EDGE
-    self._rotate_face_edge( side_id_P, direction_P, self._0730, self._0900, self._1030 )
+    self._rotate_face_edge( side_id_P, direction_P, _0730, _0900, _1030 )
 
-    self._face_minus_cube_delay( self._1030 )
-    self._face_minus_cube_delay( self._0130 )
-    self._face_minus_cube_delay( self._0430 )
-    self._face_minus_cube_delay( self._0730 )
+    self._face_minus_cube_delay( _1030 )
+    self._face_minus_cube_delay( _0130 )
+    self._face_minus_cube_delay( _0430 )
+    self._face_minus_cube_delay( _0730 )
 
     if( DEBUG_ROTATE_FACES == 1 ) :
-      print( "\tTOP:    ", self._1030, self._0000, self._0130 )
-      print( "\tMIDDLE: ", self._0900, side_id_P, self._0300 )
-      print( "\tBOTTOM: ", self._0730, self._0600, self._0430 )
+      print( "\tTOP:    ", _1030, _0000, _0130 )
+      print( "\tMIDDLE: ", _0900, side_id_P, _0300 )
+      print( "\tBOTTOM: ", _0730, _0600, _0430 )
 
-    self._side_assign( side_P, self._0000, self._0300, self._0600, self._0900, self._0130, self._0430, self._0730, self._1030 )
+    self._side_assign( side_P, _0000, _0300, _0600, _0900, _0130, _0430, _0730, _1030 )
 
     if( DEBUG_ROTATE_FACES == 1 ) :
       print( "\n" )
@@ -627,96 +864,149 @@ class RubicsCube:
       print( "\tBOTTOM: ", side_P[ RubicsCube._SIDE_INDEX_0730 ], side_P[ RubicsCube._SIDE_INDEX_0600 ], side_P[ RubicsCube._SIDE_INDEX_0430 ] )
 
   def _rotate_colors( self, direction_P, side_id_P, side_P ) :
-    self._side_deepcopy( side_P )
+    _1030, _0000, _0130, _0300, _0430, _0600, _0730, _0900 = self._side_unpack( side_P )
 
     if DEBUG_ROTATE == 1 :
-      print( "0000", self._0000, "0300", self._0300, "0600", self._0600, "0900", self._0900 )
-      print( "1030", self._1030, "0130", self._0130, "0430", self._0430, "0730", self._0730 )
+      print( "0000", _0000, "0300", _0300, "0600", _0600, "0900", _0900 )
+      print( "1030", _1030, "0130", _0130, "0430", _0430, "0730", _0730 )
 
     if direction_P == ROTATE_CLOCKWISE :
       if DEBUG_ROTATE == 1 :
         print( "CLOCKWISE" )
 
-      self._side_assign( side_P, self._0900, self._0000, self._0300, self._0600, self._1030, self._0130, self._0430, self._0730 )
+      self._side_assign( side_P, _0900, _0000, _0300, _0600, _1030, _0130, _0430, _0730 )
 
     else :
       if DEBUG_ROTATE == 1 :
         print( "COUNTER" )
 
-      self._side_assign( side_P, self._0300, self._0600, self._0900, self._0000, self._0430, self._0730, self._1030, self._0130 )
+      self._side_assign( side_P, _0300, _0600, _0900, _0000, _0430, _0730, _1030, _0130 )
 
   def RotateSide( self, side_id_P, direction_P ) :
+    LOG.Sampled( LOG_DEBUG, "RotateSide %d %d", side_id_P, direction_P )
+
     if DEBUG_ROTATE == 1 :
       print( "RotateSide {" )
 
-    side = self._side_get( side_id_P )
+    # Zobrist hash, out with the face's pieces before the move, in with them after
+    if self._hash != None :
+      self._hash ^= RubicsZobrist.SideLayers( self._cube, side_id_P )
+
+    # the pieces are relabeled in place and moved between the face's slots, nothing is copied
+    side = self._side_pieces( side_id_P )
 
     self._rotate_faces( direction_P, side_id_P, side ) 
     self._rotate_colors( direction_P, side_id_P, side )
 
     self._side_put( side_id_P, side )
 
+    if self._hash != None :
+      self._hash ^= RubicsZobrist.SideLayers( self._cube, side_id_P )
+
+    if self._history != None :
+      self._history.append( ( side_id_P, direction_P ))
+
     if DEBUG_ROTATE == 1 :
       print( "RotateSide }" )
 
+  def HashEnable( self ) :
+    self._hash = RubicsZobrist.HashLayers( self._cube )
+
+  def Hash( self ) :
+    if self._hash == None :
+      return RubicsZobrist.HashLayers( self._cube )
+
+    return self._hash
+
+  def HistoryEnable( self ) :
+    # RotateSide records every move from here on, RubicsSolver plays them back inverted
+    self._history = []
+
+  def History( self ) :
+    # None when not recorded, or no longer the way to this state
+    if self._history == None :
+      return None
+
+    return list( self._history )
+
+  def FromFacelets( self, text_P ) :
+    self._cube = RubicsStickers.ToLayers( RubicsFacelets.FromFacelets( text_P ))
+    self._history = None
+    if self._hash != None :
+      self.HashEnable()
+
+  def ToFacelets( self, faces_P = None ) :
+    if faces_P == None :
+      faces_P = FACELET_FACES
+
+    return RubicsFacelets.ToFacelets( self, faces_P )
+
   def _debug_cube( self, flag_P, msg_P, side_id_P ) :
     if flag_P == DEBUG_CUBE and ( side_id_P == CUBE_CUBE ) :
+      lines = []
       if msg_P != "" :
-        print( msg_P )
+        lines.append( msg_P )
 
-      print( "top:,", self._cube[ CUBE_TOP ] )
-      print( "mid:,", self._cube[ CUBE_MIDDLE ] )
-      print( "bot:,", self._cube[ CUBE_BOTTOM ] )
+      lines.append( "top:, %s" % self._cube[ CUBE_TOP ] )
+      lines.append( "mid:, %s" % self._cube[ CUBE_MIDDLE ] )
+      lines.append( "bot:, %s" % self._cube[ CUBE_BOTTOM ] )
+      print( "\n".join( lines ))
 
     elif flag_P == DEBUG_CUBE and ( side_id_P <= CUBE_BLUE ) :
       print( msg_P, ",", self._side_get( side_id_P ))
 
-  def PrintSide( self, flag_P, side_id_P ) :
+  def _side_text( self, flag_P, side_id_P ) :
     side = self._side_get( side_id_P )
 
     if DEBUG_PRINTSIDE == 1 :
       print( "PrintSide {", "flag_P == ", flag_P, "side_id_P == ", side_id_P )
       print( side )
 
+    label = ""
     if flag_P == PRINT_SIDE_LABEL :
       if side_id_P == CUBE_WHITE :
-        print( "\nWHITE SIDE %d" % CUBE_WHITE )
+        label = "\nWHITE SIDE %d\n" % CUBE_WHITE
 
       elif side_id_P == CUBE_YELLOW :
-        print( "\nYELLOW SIDE %d" % CUBE_YELLOW )
+        label = "\nYELLOW SIDE %d\n" % CUBE_YELLOW
 
       elif side_id_P == CUBE_RED :
-        print( "\nRED SIDE %d" % CUBE_RED )
+        label = "\nRED SIDE %d\n" % CUBE_RED
 
       elif side_id_P == CUBE_GREEN :
-        print( "\nGREEN SIDE %d" % CUBE_GREEN )
+        label = "\nGREEN SIDE %d\n" % CUBE_GREEN
 
       elif side_id_P == CUBE_ORANGE :
-        print( "\nORANGE SIDE %d" % CUBE_ORANGE )
+        label = "\nORANGE SIDE %d\n" % CUBE_ORANGE
 
       elif side_id_P == CUBE_BLUE :
-        print( "\nBLUE SIDE %d" % CUBE_BLUE )
+        label = "\nBLUE SIDE %d\n" % CUBE_BLUE
 
       else :
-        print( "ERROR: invalid side", __FILE__(), " @ ", __LINE__ )
+        LOG.Error( "invalid side %d", side_id_P )
         exit()
 
-    face_1030 = self._side_corner_color_get( side_id_P, side, RubicsCube._SIDE_INDEX_1030 )
-    face_0000 = self._side_edge_color_get( side_id_P, side, RubicsCube._SIDE_INDEX_0000 )
-    face_0130 = self._side_corner_color_get( side_id_P, side, RubicsCube._SIDE_INDEX_0130 )
-    face_0300 = self._side_edge_color_get( side_id_P, side, RubicsCube._SIDE_INDEX_0300 )
-    face_0430 = self._side_corner_color_get( side_id_P, side, RubicsCube._SIDE_INDEX_0430 )
-    face_0600 = self._side_edge_color_get( side_id_P, side, RubicsCube._SIDE_INDEX_0600 )
-    face_0730 = self._side_corner_color_get( side_id_P, side, RubicsCube._SIDE_INDEX_0730 )
-    face_0900 = self._side_edge_color_get( side_id_P, side, RubicsCube._SIDE_INDEX_0900 )
-    
-    print( "  -------------" )
-    print( "  |" , face_1030, "|", face_0000, "|", face_0130, "|" )
-    print( "  -------------", )
-    print( "  |" , face_0900, "|", side_id_P, "|", face_0300, "|" )
-    print( "  -------------", )
-    print( "  |" , face_0730, "|", face_0600, "|", face_0430, "|" )
-    print( "  -------------\n" )
+    face_1030 = side.Color( RubicsCube._SIDE_INDEX_1030 )
+    face_0000 = side.Color( RubicsCube._SIDE_INDEX_0000 )
+    face_0130 = side.Color( RubicsCube._SIDE_INDEX_0130 )
+    face_0300 = side.Color( RubicsCube._SIDE_INDEX_0300 )
+    face_0430 = side.Color( RubicsCube._SIDE_INDEX_0430 )
+    face_0600 = side.Color( RubicsCube._SIDE_INDEX_0600 )
+    face_0730 = side.Color( RubicsCube._SIDE_INDEX_0730 )
+    face_0900 = side.Color( RubicsCube._SIDE_INDEX_0900 )
+
+    return ( label +
+      "  -------------\n" +
+      "  | %s | %s | %s |\n" % ( face_1030, face_0000, face_0130 ) +
+      "  -------------\n" +
+      "  | %s | %s | %s |\n" % ( face_0900, side_id_P, face_0300 ) +
+      "  -------------\n" +
+      "  | %s | %s | %s |\n" % ( face_0730, face_0600, face_0430 ) +
+      "  -------------\n\n" )
+
+  def PrintSide( self, flag_P, side_id_P ) :
+    # one write per face instead of one per line
+    sys.stdout.write( self._side_text( flag_P, side_id_P ))
 
   def DebugCube( self, msg_P ) :
     self._debug_cube( 1, msg_P, CUBE_CUBE )
@@ -762,53 +1052,58 @@ class RubicsCube:
     solved_missing_1 = CUBE_ID
     solved_missing_2 = CUBE_ID
 
+    # the faces go out in one write
+    text = []
+
     if side_id_P == CUBE_WHITE or side_id_P == CUBE_YELLOW :
-      self.PrintSide( PRINT_SIDE_LABEL, CUBE_RED )
-      self.PrintSide( PRINT_SIDE_LABEL, CUBE_GREEN )
-      self.PrintSide( PRINT_SIDE_LABEL, CUBE_ORANGE )
-      self.PrintSide( PRINT_SIDE_LABEL, CUBE_BLUE )
+      text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_RED ))
+      text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_GREEN ))
+      text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_ORANGE ))
+      text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_BLUE ))
 
       solved_missing_1 = CUBE_WHITE
       solved_missing_2 = CUBE_YELLOW
 
     else :
-      self.PrintSide( PRINT_SIDE_LABEL, CUBE_WHITE )
-      self.PrintSide( PRINT_SIDE_LABEL, CUBE_YELLOW )
+      text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_WHITE ))
+      text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_YELLOW ))
 
       if side_id_P == CUBE_RED :
-        self.PrintSide( PRINT_SIDE_LABEL, CUBE_GREEN )
-        self.PrintSide( PRINT_SIDE_LABEL, CUBE_BLUE )
+        text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_GREEN ))
+        text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_BLUE ))
 
         solved_missing_1 = CUBE_RED
         solved_missing_2 = CUBE_ORANGE
 
       elif side_id_P == CUBE_GREEN :
-        self.PrintSide( PRINT_SIDE_LABEL, CUBE_RED )
-        self.PrintSide( PRINT_SIDE_LABEL, CUBE_ORANGE )
+        text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_RED ))
+        text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_ORANGE ))
 
         solved_missing_1 = CUBE_GREEN
         solved_missing_2 = CUBE_BLUE
 
       elif side_id_P == CUBE_ORANGE :
-        self.PrintSide( PRINT_SIDE_LABEL, CUBE_GREEN )
-        self.PrintSide( PRINT_SIDE_LABEL, CUBE_BLUE )
+        text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_GREEN ))
+        text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_BLUE ))
 
         solved_missing_1 = CUBE_RED
         solved_missing_2 = CUBE_ORANGE
 
       else :
-        self.PrintSide( PRINT_SIDE_LABEL, CUBE_ORANGE )
-        self.PrintSide( PRINT_SIDE_LABEL, CUBE_RED )
+        text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_ORANGE ))
+        text.append( self._side_text( PRINT_SIDE_LABEL, CUBE_RED ))
 
         solved_missing_1 = CUBE_GREEN
         solved_missing_2 = CUBE_BLUE
 
     if flag_P == TEST_ROTATE_BACK :
       if solved_missing_1 != CUBE_ID :
-        self.PrintSide( PRINT_SIDE_LABEL, solved_missing_1 )
+        text.append( self._side_text( PRINT_SIDE_LABEL, solved_missing_1 ))
 
       if solved_missing_2 != CUBE_ID :
-        self.PrintSide( PRINT_SIDE_LABEL, solved_missing_2 )
+        text.append( self._side_text( PRINT_SIDE_LABEL, solved_missing_2 ))
+
+    sys.stdout.write( "".join( text ))
 
     close = "}"
     if flag_P == TEST_ROTATE_BACK :
@@ -819,12 +1114,11 @@ class RubicsCube:
     self._test_resolve_msg( flag_P, side_id_P, self._cube == self._cube_solved )
 
   def PrintCube( self ) :
-    self.PrintSide( PRINT_SIDE_LABEL, CUBE_WHITE )
-    self.PrintSide( PRINT_SIDE_LABEL, CUBE_YELLOW )
-    self.PrintSide( PRINT_SIDE_LABEL, CUBE_RED )
-    self.PrintSide( PRINT_SIDE_LABEL, CUBE_GREEN )
-    self.PrintSide( PRINT_SIDE_LABEL, CUBE_ORANGE )
-    self.PrintSide( PRINT_SIDE_LABEL, CUBE_BLUE )
+    text = []
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      text.append( self._side_text( PRINT_SIDE_LABEL, side_id ))
+
+    sys.stdout.write( "".join( text ))
 
   def _y_permutator_core( self, side_id_1_P, side_id_2_P, rotate_bracket_P, rotate_mid_P ) :
     self.RotateSide( side_id_1_P, rotate_bracket_P )
@@ -841,7 +1135,7 @@ class RubicsCube:
   def Y_Permutator( self, side_id_1_P, side_id_2_P, side_id_orientation_P ) :
     if side_id_1_P == CUBE_WHITE :
       if side_id_2_P == CUBE_YELLOW :
-        print( "invalid side_2 for Y_Permutator", __LINE__ )
+        LOG.Error( "invalid side_2 for Y_Permutator" )
         exit()
 
       if side_id_orientation_P == CUBE_RED :
@@ -852,7 +1146,7 @@ class RubicsCube:
           self._y_permutator_counter( CUBE_WHITE, CUBE_BLUE )
 
         else :
-          print( "invalid side_2 match, should be RED or BLUE was %d", side_id_2_P )
+          LOG.Error( "invalid side_2 match, should be RED or BLUE was %d", side_id_2_P )
           exit()
 
       elif side_id_orientation_P == CUBE_GREEN :
@@ -863,7 +1157,7 @@ class RubicsCube:
           self._y_permutator_counter( CUBE_WHITE, CUBE_RED )
 
         else :
-          print( "invalid side_2 match, should be RED or BLUE was %d", side_id_2_P )
+          LOG.Error( "invalid side_2 match, should be RED or BLUE was %d", side_id_2_P )
           exit()
 
       elif side_id_orientation_P == CUBE_ORANGE :
@@ -874,7 +1168,7 @@ class RubicsCube:
           self._y_permutator_counter( CUBE_WHITE, CUBE_GREEN )
 
         else :
-          print( "invalid side_2 match, should be RED or BLUE was %d", side_id_2_P )
+          LOG.Error( "invalid side_2 match, should be RED or BLUE was %d", side_id_2_P )
           exit()
 
       elif side_id_orientation_P == CUBE_BLUE :
@@ -885,11 +1179,11 @@ class RubicsCube:
           self._y_permutator_counter( CUBE_WHITE, CUBE_ORANGE )
 
         else :
-          print( "invalid side_2 match, should be RED or BLUE was %d", side_id_2_P )
+          LOG.Error( "invalid side_2 match, should be RED or BLUE was %d", side_id_2_P )
           exit()
 
       else :
-        print( "invalid orientation for Y_Permutator", __LINE__ )
+        LOG.Error( "invalid orientation for Y_Permutator" )
 
 
   def TestRotateRandom( self ) :
@@ -928,59 +1222,3566 @@ class RubicsCube:
 
     return j
 
-cube = RubicsCube()
-
-print( "BEG TEST {" )
-cube.PrintCube()
-
-cube.TestRotate( TEST_ROTATE, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, 1 )
-cube.TestRotate( TEST_ROTATE, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
-cube.TestRotate( TEST_ROTATE, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, 3 )
-cube.TestRotate( TEST_ROTATE, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, 4 )
-cube.TestRotate( TEST_ROTATE_BACK, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, 2 ) # back to solved
-
-cube.TestRotate( TEST_ROTATE, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, 1 )
-cube.TestRotate( TEST_ROTATE, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
-cube.TestRotate( TEST_ROTATE, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, 3 )
-cube.TestRotate( TEST_ROTATE, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, 4 )
-cube.TestRotate( TEST_ROTATE_BACK, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, 2 ) # back to solved
-
-cube.TestRotate( TEST_ROTATE, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, 1 )
-cube.TestRotate( TEST_ROTATE, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
-cube.TestRotate( TEST_ROTATE, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, 3 )
-cube.TestRotate( TEST_ROTATE, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, 4 )
-cube.TestRotate( TEST_ROTATE_BACK, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, 2 ) # back to solved
-
-cube.TestRotate( TEST_ROTATE, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, 1 )
-cube.TestRotate( TEST_ROTATE, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
-cube.TestRotate( TEST_ROTATE, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, 3 )
-cube.TestRotate( TEST_ROTATE, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, 4 )
-cube.TestRotate( TEST_ROTATE_BACK, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, 2 ) # back to solved
-
-cube.TestRotate( TEST_ROTATE, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, 1 )
-cube.TestRotate( TEST_ROTATE, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
-cube.TestRotate( TEST_ROTATE, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, 3 )
-cube.TestRotate( TEST_ROTATE, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, 4 )
-cube.TestRotate( TEST_ROTATE_BACK, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, 2 ) # back to solved
-
-cube.TestRotate( TEST_ROTATE, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, 1 )
-cube.TestRotate( TEST_ROTATE, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
-cube.TestRotate( TEST_ROTATE, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, 3 )
-cube.TestRotate( TEST_ROTATE, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, 4 )
-cube.TestRotate( TEST_ROTATE_BACK, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, 2 ) # back to solved
-
-print( "START OF MUTLI SIDE ROTATIONS" )
-iterations_total = 0
-for y in range( 0, TEST_ROTATE_RANDOM_ITERATIONS_1 ) :
-  for x in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
-    iterations = cube.TestRotateRandom() 
-    iterations_total += iterations
-    print( iterations )
-
-cube.PrintCube()
-if cube._cube == cube._cube_solved :
-  print( "\tCUBE SOLVED after %d random iterations" % iterations_total )
-else :
-  print( "\tCUBE UNSOLVED ****************** after %d random iterations" % iterations_total )
-
-print( "END TEST }" )
+# the slots of a side never change, build them once
+RubicsCube._SIDE_SLOTS = tuple( [ None ] + [ RubicsCube._side_slots_build( side_id ) for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) ] )
+
+# WHITE and RED in PrintSide order after RED clockwise
+FACE_TEST_WHITE = [ [ 4, 4, 4 ], [ 1, 1, 1 ], [ 1, 1, 1 ] ]
+FACE_TEST_RED = [ [ 3, 3, 3 ], [ 3, 3, 3 ], [ 3, 3, 3 ] ]
+
+def TestFaceView() :
+  # views made on a solved cube against known colors after a turn, every field against the
+  # layers, and writes through a view against the cube they must not reach
+  failures = 0
+  checks = []
+
+  cube = RubicsCube()
+  white = cube.Face( CUBE_WHITE )
+  red = cube.FaceStickers( CUBE_RED )
+  checks.append( ( "solved", [ list( cube.FaceStickers( side_id )) for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) ],
+                   [ [ side_id ] * 9 for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) ] ))
+
+  cube.RotateSide( CUBE_RED, ROTATE_CLOCKWISE )
+  checks.append( ( "white", white.Stickers().Rows(), FACE_TEST_WHITE ))
+  checks.append( ( "red", red.Rows(), FACE_TEST_RED ))
+
+  fields = 0
+  for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+    face = cube.Face( side_id )
+    for side_index in range( 0, CUBE_SIDE_COUNT ) :
+      layer, slot = RubicsCube._SIDE_SLOTS[ side_id ][ side_index ]
+      piece = cube._cube[ layer ][ slot ]
+      found = [ face.Field( side_index, field ) for field in range( 0, len( piece )) ]
+      if found != piece or list( face[ side_index ] ) != piece or len( face[ side_index ] ) != len( piece ) :
+        fields += 1
+
+  checks.append( ( "fields", fields, 0 ))
+
+  before = [ list( piece ) for piece in white ]
+  rejected = 0
+  for write in ( lambda : white.__setitem__( 0, CUBE_NIL ), lambda : white[ 0 ].__setitem__( CUBE_EDGE_0, CUBE_BLUE )) :
+    try :
+      write()
+    except ( AttributeError, TypeError ) :
+      rejected += 1
+
+  checks.append( ( "writes", ( rejected, [ list( piece ) for piece in white ] ), ( 2, before )))
+
+  for name, found, expected in checks :
+    if found != expected :
+      print( "\tFACE VIEW MISMATCH ****************** %s %r" % ( name, found ))
+      failures += 1
+
+  print( "Face view: %d checks, %d mismatches" % ( len( checks ), failures ))
+  assert failures == 0
+
+#
+# Sticker engine.
+#
+# The 48 moving stickers (8 corners * 3 + 12 edges * 2) are numbered by location:
+#     corner position k, face j  => 3 * k + j
+#     edge position e, face j    => STICKER_EDGE_BASE + 2 * e + j
+#
+# Face 0 of a location is its reference face: WHITE/YELLOW for corners and top/bottom edges,
+# RED/ORANGE for middle edges.  A state is a tuple of 48 sticker ids, state[ loc ] is the home
+# location of the sticker now at loc, so the solved state is range( 48 ) and a move is a
+# permutation: new[ loc ] = old[ move[ loc ]].
+#
+# The move tables are not written by hand, they are read back from RubicsCube.RotateSide, so both
+# engines describe the same 'reality'.  RubicsFuzz holds RotateSide itself to FUZZ_REFERENCE.
+#
+
+STICKER_COUNT = 48
+STICKER_CORNERS = 8
+STICKER_EDGES = 12
+STICKER_EDGE_BASE = 24
+
+STICKER_SOLVED = tuple( range( STICKER_COUNT ))
+
+# face 0 of each of the 20 positions, the sticker there names the piece and its twist or flip
+STICKER_POSITIONS = STICKER_CORNERS + STICKER_EDGES
+STICKER_REFS = tuple( list( range( 0, STICKER_EDGE_BASE, 3 )) + list( range( STICKER_EDGE_BASE, STICKER_COUNT, 2 )))
+
+RANDOM_STATE_PARITY_SWAP = 10
+
+# held while any lazy table is built, tables are read without it once their flag is set
+_TABLES_LOCK = threading.RLock()
+
+try :
+  import numpy
+except ImportError :
+  numpy = None
+
+class RubicsStickers:
+
+  _CORNER_SLOTS = [ ( CUBE_TOP, 1 ), ( CUBE_TOP, 3 ), ( CUBE_TOP, 5 ), ( CUBE_TOP, 7 ), ( CUBE_BOTTOM, 1 ), ( CUBE_BOTTOM, 3 ), ( CUBE_BOTTOM, 5 ), ( CUBE_BOTTOM, 7 ) ]
+  _EDGE_SLOTS = [ ( CUBE_TOP, 0 ), ( CUBE_TOP, 2 ), ( CUBE_TOP, 4 ), ( CUBE_TOP, 6 ), ( CUBE_MIDDLE, 1 ), ( CUBE_MIDDLE, 3 ), ( CUBE_MIDDLE, 5 ), ( CUBE_MIDDLE, 7 ), ( CUBE_BOTTOM, 0 ), ( CUBE_BOTTOM, 2 ), ( CUBE_BOTTOM, 4 ), ( CUBE_BOTTOM, 6 ) ]
+
+  _tables = None
+
+  _loc_slot = None      # loc -> ( layer, slot )
+  _loc_face = None      # loc -> face the location points at, also the color of the sticker whose home is loc
+  _loc_first = None     # loc -> 1 when loc is face 0 of its position
+  _sticker_field = None # sticker -> index of its face in the legacy piece list
+  _slot_loc = None      # ( layer, slot, face ) -> loc
+  _piece_base = None    # tuple( colors ) -> first sticker of the piece
+  _layers = None        # solved legacy layers, the piece templates
+  _moves = None         # [ side_id ][ direction ] -> permutation
+  _corner_stickers = None   # 3 * piece + twist -> stickers on faces 0, 1, 2 of a corner position
+  _edge_stickers = None     # 2 * piece + flip -> stickers on faces 0, 1 of an edge position
+  _face_locs = None         # side_id -> locations of the face as PrintSide reads it, None for the center
+  _slot_stickers = {}       # ( layer, slot, piece ) -> stickers at the locations of the slot, filled as met
+
+  def __init__( self, stickers_P = STICKER_SOLVED ) :
+    RubicsStickers._tables_init()
+    self._s = tuple( stickers_P )
+
+  @staticmethod
+  def _tables_init() :
+    if RubicsStickers._tables != None :
+      return
+
+    with _TABLES_LOCK :
+      if RubicsStickers._tables == None :
+        RubicsStickers._tables_build()
+
+  @staticmethod
+  def _tables_build() :
+    top = [ RubicsCube._CUBE_WR, RubicsCube._CUBE_WRG, RubicsCube._CUBE_WG, RubicsCube._CUBE_WGO, RubicsCube._CUBE_WO, RubicsCube._CUBE_WOB, RubicsCube._CUBE_WB, RubicsCube._CUBE_WBR ]
+    mid = [ RubicsCube._CUBE_RED, RubicsCube._CUBE_RGM, RubicsCube._CUBE_GED, RubicsCube._CUBE_GOM, RubicsCube._CUBE_OED, RubicsCube._CUBE_OBM, RubicsCube._CUBE_BED, RubicsCube._CUBE_BRM ]
+    bot = [ RubicsCube._CUBE_YR, RubicsCube._CUBE_YGR, RubicsCube._CUBE_YG, RubicsCube._CUBE_YOG, RubicsCube._CUBE_YO, RubicsCube._CUBE_YBO, RubicsCube._CUBE_YB, RubicsCube._CUBE_YRB ]
+    layers = [ top, mid, bot ]
+
+    loc_slot = []
+    loc_face = []
+    loc_first = []
+    sticker_field = []
+    piece_base = {}
+
+    for layer, slot in RubicsStickers._CORNER_SLOTS :
+      piece = layers[ layer ][ slot ]
+      piece_base[ tuple( piece[ CUBE_CORNER_0 : CUBE_CORNER_2 + 1 ] ) ] = len( loc_slot )
+
+      for j in range( 0, 3 ) :
+        loc_slot.append( ( layer, slot ) )
+        loc_face.append( piece[ CUBE_CORNER_FACE_0 + j ] )
+        loc_first.append( j == 0 )
+        sticker_field.append( CUBE_CORNER_FACE_0 + j )
+
+    for layer, slot in RubicsStickers._EDGE_SLOTS :
+      piece = layers[ layer ][ slot ]
+      piece_base[ tuple( piece[ CUBE_EDGE_0 : CUBE_EDGE_1 + 1 ] ) ] = len( loc_slot )
+
+      # the reference color goes first, GREEN/ORANGE and BLUE/RED list it second
+      swap = 0
+      if piece[ CUBE_EDGE_0 ] not in ( CUBE_WHITE, CUBE_YELLOW, CUBE_RED, CUBE_ORANGE ) :
+        swap = 1
+
+      for j in range( 0, 2 ) :
+        loc_slot.append( ( layer, slot ) )
+        loc_face.append( piece[ CUBE_EDGE_FACE_0 + ( j ^ swap ) ] )
+        loc_first.append( j == 0 )
+        sticker_field.append( CUBE_EDGE_FACE_0 + ( j ^ swap ) )
+
+    slot_loc = {}
+    for loc in range( 0, STICKER_COUNT ) :
+      slot_loc[ loc_slot[ loc ] + ( loc_face[ loc ], ) ] = loc
+
+    RubicsStickers._loc_slot = tuple( loc_slot )
+    RubicsStickers._loc_face = tuple( loc_face )
+    RubicsStickers._loc_first = tuple( loc_first )
+    RubicsStickers._sticker_field = tuple( sticker_field )
+    RubicsStickers._slot_loc = slot_loc
+    RubicsStickers._piece_base = piece_base
+    RubicsStickers._layers = layers
+
+    corner_stickers = []
+    for p in range( 0, STICKER_CORNERS ) :
+      for o in range( 0, 3 ) :
+        stickers = [ 0, 0, 0 ]
+        for t in range( 0, 3 ) :
+          stickers[ ( o + t ) % 3 ] = 3 * p + t
+
+        corner_stickers.append( tuple( stickers ))
+
+    edge_stickers = []
+    for p in range( 0, STICKER_EDGES ) :
+      for o in range( 0, 2 ) :
+        stickers = [ 0, 0 ]
+        for t in range( 0, 2 ) :
+          stickers[ o ^ t ] = STICKER_EDGE_BASE + 2 * p + t
+
+        edge_stickers.append( tuple( stickers ))
+
+    # PrintSide order: 1030 0000 0130 / 0900 center 0300 / 0730 0600 0430
+    face_locs = [ None ]
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      rows = [ CUBE_TOP, CUBE_MIDDLE, CUBE_BOTTOM ]
+      if side_id == CUBE_WHITE :
+        rows = [ CUBE_TOP, CUBE_TOP, CUBE_TOP ]
+
+      elif side_id == CUBE_YELLOW :
+        rows = [ CUBE_BOTTOM, CUBE_BOTTOM, CUBE_BOTTOM ]
+
+      cells = [ ( rows[ 0 ], RubicsCube._SIDE_INDEX_1030 ), ( rows[ 0 ], RubicsCube._SIDE_INDEX_0000 ), ( rows[ 0 ], RubicsCube._SIDE_INDEX_0130 ),
+                ( rows[ 1 ], RubicsCube._SIDE_INDEX_0900 ), None, ( rows[ 1 ], RubicsCube._SIDE_INDEX_0300 ),
+                ( rows[ 2 ], RubicsCube._SIDE_INDEX_0730 ), ( rows[ 2 ], RubicsCube._SIDE_INDEX_0600 ), ( rows[ 2 ], RubicsCube._SIDE_INDEX_0430 ) ]
+
+      locs = []
+      for cell in cells :
+        if cell == None :
+          locs.append( None )
+
+        else :
+          layer, index = cell
+          locs.append( slot_loc[ ( layer, RubicsCube._SIDE_INDEX[ side_id ][ index ], side_id ) ] )
+
+      face_locs.append( tuple( locs ))
+
+    RubicsStickers._face_locs = tuple( face_locs )
+    RubicsStickers._corner_stickers = tuple( corner_stickers )
+    RubicsStickers._edge_stickers = tuple( edge_stickers )
+
+    # read every quarter turn back from the legacy engine
+    moves = [ None ]
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      directions = []
+      for direction in ( ROTATE_CLOCKWISE, ROTATE_COUNTER ) :
+        cube = RubicsCube()
+        cube.RotateSide( side_id, direction )
+        directions.append( RubicsStickers._from_layers( cube._cube ))
+
+      moves.append( tuple( directions ))
+
+    RubicsStickers._moves = tuple( moves )
+
+    # set last, other threads skip the lock as soon as they see it
+    RubicsStickers._tables = 1
+
+  @staticmethod
+  def FromLayers( layers_P ) :
+    RubicsStickers._tables_init()
+    return RubicsStickers._from_layers( layers_P )
+
+  @staticmethod
+  def _from_layers( layers_P ) :
+    # a slot's locations are consecutive, so the state is the stickers of every slot in turn
+    cache = RubicsStickers._slot_stickers
+    s = []
+    for slots in ( RubicsStickers._CORNER_SLOTS, RubicsStickers._EDGE_SLOTS ) :
+      for layer, slot in slots :
+        piece = layers_P[ layer ][ slot ]
+        key = ( layer, slot, tuple( piece ))
+        stickers = cache.get( key )
+        if stickers == None :
+          stickers = RubicsStickers._piece_stickers( layer, slot, piece )
+          with _TABLES_LOCK :
+            cache[ key ] = stickers
+
+        s.extend( stickers )
+
+    return tuple( s )
+
+  @staticmethod
+  def _piece_stickers( layer_P, slot_P, piece_P ) :
+    # KeyError when the piece or one of its faces is not known
+    if piece_P[ CUBE_TYPE ] == CUBE_CORNER :
+      base = RubicsStickers._piece_base[ tuple( piece_P[ CUBE_CORNER_0 : CUBE_CORNER_2 + 1 ] ) ]
+      count = 3
+
+    else :
+      base = RubicsStickers._piece_base[ tuple( piece_P[ CUBE_EDGE_0 : CUBE_EDGE_1 + 1 ] ) ]
+      count = 2
+
+    stickers = {}
+    for sticker in range( base, base + count ) :
+      face = piece_P[ RubicsStickers._sticker_field[ sticker ] ]
+      stickers[ RubicsStickers._slot_loc[ ( layer_P, slot_P, face ) ] ] = sticker
+
+    return tuple( [ stickers[ loc ] for loc in sorted( stickers ) ] )
+
+  @staticmethod
+  def ToLayers( stickers_P ) :
+    RubicsStickers._tables_init()
+    return RubicsStickers._to_layers( stickers_P )
+
+  @staticmethod
+  def _to_layers( stickers_P ) :
+    layers = copy.deepcopy( RubicsStickers._layers )
+    for loc in range( 0, STICKER_COUNT ) :
+      sticker = stickers_P[ loc ]
+      layer, slot = RubicsStickers._loc_slot[ loc ]
+
+      # face 0 of a position brings the template of the piece that sits there
+      if RubicsStickers._loc_first[ loc ] :
+        home_layer, home_slot = RubicsStickers._loc_slot[ sticker ]
+        layers[ layer ][ slot ] = list( RubicsStickers._layers[ home_layer ][ home_slot ] )
+
+      layers[ layer ][ slot ][ RubicsStickers._sticker_field[ sticker ]] = RubicsStickers._loc_face[ loc ]
+
+    return layers
+
+  @staticmethod
+  def FromCubies( cp_P, co_P, ep_P, eo_P ) :
+    RubicsStickers._tables_init()
+    corner = RubicsStickers._corner_stickers
+    edge = RubicsStickers._edge_stickers
+
+    s = []
+    for k in range( 0, STICKER_CORNERS ) :
+      s.extend( corner[ 3 * cp_P[ k ] + co_P[ k ]] )
+
+    for e in range( 0, STICKER_EDGES ) :
+      s.extend( edge[ 2 * ep_P[ e ] + eo_P[ e ]] )
+
+    return tuple( s )
+
+  @staticmethod
+  def ToCubies( stickers_P ) :
+    cp = [ 0 ] * STICKER_CORNERS
+    co = [ 0 ] * STICKER_CORNERS
+    ep = [ 0 ] * STICKER_EDGES
+    eo = [ 0 ] * STICKER_EDGES
+
+    for k in range( 0, STICKER_CORNERS ) :
+      for j in range( 0, 3 ) :
+        sticker = stickers_P[ 3 * k + j ]
+        if sticker % 3 == 0 :
+          cp[ k ] = sticker // 3
+          co[ k ] = j
+
+    for e in range( 0, STICKER_EDGES ) :
+      for j in range( 0, 2 ) :
+        sticker = stickers_P[ STICKER_EDGE_BASE + 2 * e + j ] - STICKER_EDGE_BASE
+        if sticker % 2 == 0 :
+          ep[ e ] = sticker // 2
+          eo[ e ] = j
+
+    return cp, co, ep, eo
+
+  @staticmethod
+  def ToRefs( stickers_P ) :
+    return tuple( [ stickers_P[ loc ] for loc in STICKER_REFS ] )
+
+  @staticmethod
+  def FromRefs( refs_P ) :
+    # a corner holds 3 * piece + t on face 0 when its twist is -t, an edge 2 * piece + flip
+    RubicsStickers._tables_init()
+    corner = RubicsStickers._corner_stickers
+    edge = RubicsStickers._edge_stickers
+
+    s = []
+    for k in range( 0, STICKER_CORNERS ) :
+      sticker = refs_P[ k ]
+      s.extend( corner[ sticker - sticker % 3 + ( -sticker ) % 3 ] )
+
+    for e in range( 0, STICKER_EDGES ) :
+      s.extend( edge[ refs_P[ STICKER_CORNERS + e ] - STICKER_EDGE_BASE ] )
+
+    return tuple( s )
+
+  @staticmethod
+  def Apply( stickers_P, side_id_P, direction_P ) :
+    RubicsStickers._tables_init()
+    return tuple( [ stickers_P[ i ] for i in RubicsStickers._moves[ side_id_P ][ direction_P ]] )
+
+  def RotateSide( self, side_id_P, direction_P ) :
+    self._s = tuple( [ self._s[ i ] for i in RubicsStickers._moves[ side_id_P ][ direction_P ]] )
+
+  def Stickers( self ) :
+    return self._s
+
+  def Layers( self ) :
+    return RubicsStickers.ToLayers( self._s )
+
+  def Cube( self ) :
+    cube = RubicsCube()
+    cube._cube = RubicsStickers.ToLayers( self._s )
+    return cube
+
+  def IsSolved( self ) :
+    return self._s == STICKER_SOLVED
+
+def _permutation_parity( perm_P ) :
+  parity = 0
+  seen = [ 0 ] * len( perm_P )
+  for i in range( 0, len( perm_P )) :
+    if seen[ i ] == 0 :
+      j = i
+      length = 0
+      while seen[ j ] == 0 :
+        seen[ j ] = 1
+        j = perm_P[ j ]
+        length += 1
+
+      parity ^= ( length + 1 ) & 1
+
+  return parity
+
+def _numpy_permutation_parity( perms_P ) :
+  # one row per permutation, parity by counting inversions column pair by column pair
+  parity = numpy.zeros( perms_P.shape[ 0 ], dtype = numpy.uint8 )
+  for i in range( 0, perms_P.shape[ 1 ] ) :
+    for j in range( i + 1, perms_P.shape[ 1 ] ) :
+      parity ^= perms_P[ :, i ] > perms_P[ :, j ]
+
+  return parity
+
+def _numpy_shuffle_digits( rnd_P, count_P, size_P ) :
+  # Fisher-Yates digits in factorial base from one draw below size! per row, digit k swaps
+  # position size - 1 - k with one at or before it, so the parity is the number of digits that
+  # really swap, and the last digit, 0 or 1, flips it
+  number = rnd_P.integers( 0, math.factorial( size_P ), count_P, dtype = numpy.uint32 )
+  digits = numpy.empty( ( count_P, size_P - 1 ), dtype = numpy.uint8 )
+  parity = numpy.zeros( count_P, dtype = numpy.uint8 )
+  for k in range( 0, size_P - 1 ) :
+    digits[ :, k ] = number % ( size_P - k )
+    number //= size_P - k
+    parity ^= digits[ :, k ] != size_P - 1 - k
+
+  return digits, parity
+
+def _numpy_shuffle( digits_P ) :
+  # all rows swapped at once through flat indices, faster than fancy indexing by row
+  count, size = digits_P.shape[ 0 ], digits_P.shape[ 1 ] + 1
+  perms = numpy.tile( numpy.arange( size, dtype = numpy.uint8 ), ( count, 1 ))
+  flat = perms.reshape( -1 )
+  rows = numpy.arange( 0, count * size, size )
+  for k in range( 0, size - 1 ) :
+    position = size - 1 - k
+    index = rows + digits_P[ :, k ]
+    other = flat[ index ]
+    flat[ index ] = perms[ :, position ]
+    perms[ :, position ] = other
+
+  return perms
+
+#
+# Uniform random states.
+#
+# A state of the whole cube group is drawn directly: random corner and edge permutations with equal
+# parity, 7 free corner twists and 11 free edge flips, the last twist and flip fixing the sums.
+# Every reachable state is equally likely, unlike the random walks of TestRotateRandom.
+#
+# States() packs STICKER_COUNT bytes per state into one bytearray, StatesArray() fills a numpy
+# array in vectorized form when numpy is installed.  Both are deterministic from the seed, each
+# with its own stream.
+#
+
+class RubicsRandom:
+
+  def __init__( self, seed_P ) :
+    RubicsStickers._tables_init()
+    self._seed = seed_P
+    self._random = random.Random( seed_P )
+    self._numpy_random = None
+
+  def _cubies( self ) :
+    rnd = self._random
+
+    cp = list( range( 0, STICKER_CORNERS ))
+    ep = list( range( 0, STICKER_EDGES ))
+    rnd.shuffle( cp )
+    rnd.shuffle( ep )
+
+    if _permutation_parity( cp ) != _permutation_parity( ep ) :
+      ep[ RANDOM_STATE_PARITY_SWAP ], ep[ RANDOM_STATE_PARITY_SWAP + 1 ] = ep[ RANDOM_STATE_PARITY_SWAP + 1 ], ep[ RANDOM_STATE_PARITY_SWAP ]
+
+    co = [ rnd.randrange( 0, 3 ) for k in range( 0, STICKER_CORNERS - 1 ) ]
+    co.append( -sum( co ) % 3 )
+
+    eo = [ rnd.randrange( 0, 2 ) for e in range( 0, STICKER_EDGES - 1 ) ]
+    eo.append( sum( eo ) % 2 )
+
+    return cp, co, ep, eo
+
+  def State( self ) :
+    cp, co, ep, eo = self._cubies()
+    return RubicsStickers.FromCubies( cp, co, ep, eo )
+
+  def States( self, count_P ) :
+    buffer = bytearray( count_P * STICKER_COUNT )
+    for i in range( 0, count_P ) :
+      buffer[ i * STICKER_COUNT : ( i + 1 ) * STICKER_COUNT ] = self.State()
+
+    return buffer
+
+  def StatesArray( self, count_P ) :
+    if numpy == None :
+      raise ImportError( "StatesArray needs numpy" )
+
+    if self._numpy_random == None :
+      self._numpy_random = numpy.random.default_rng( self._seed )
+
+    rnd = self._numpy_random
+
+    # flipping the 0 or 1 of the last edge digit is one to one, the edges stay uniform
+    corner_digits, corner_parity = _numpy_shuffle_digits( rnd, count_P, STICKER_CORNERS )
+    edge_digits, edge_parity = _numpy_shuffle_digits( rnd, count_P, STICKER_EDGES )
+    edge_digits[ :, -1 ] ^= corner_parity ^ edge_parity
+
+    cp = _numpy_shuffle( corner_digits )
+    ep = _numpy_shuffle( edge_digits )
+
+    co = rnd.integers( 0, 3, ( count_P, STICKER_CORNERS ), dtype = numpy.uint8 )
+    co[ :, -1 ] = ( 3 * STICKER_CORNERS - co[ :, : -1 ].sum( axis = 1, dtype = numpy.uint8 )) % 3
+
+    eo = rnd.integers( 0, 2, ( count_P, STICKER_EDGES ), dtype = numpy.uint8 )
+    eo[ :, -1 ] = eo[ :, : -1 ].sum( axis = 1, dtype = numpy.uint8 ) % 2
+
+    corner = numpy.array( RubicsStickers._corner_stickers, dtype = numpy.uint8 )
+    edge = numpy.array( RubicsStickers._edge_stickers, dtype = numpy.uint8 )
+
+    # take() of whole table rows, fancy indexing of the same rows is several times slower
+    states = numpy.empty( ( count_P, STICKER_COUNT ), dtype = numpy.uint8 )
+    states[ :, : STICKER_EDGE_BASE ] = corner.take( 3 * cp + co, axis = 0 ).reshape( count_P, STICKER_EDGE_BASE )
+    states[ :, STICKER_EDGE_BASE : ] = edge.take( 2 * ep + eo, axis = 0 ).reshape( count_P, STICKER_COUNT - STICKER_EDGE_BASE )
+
+    return states
+
+  def Scramble( self, state_P, solver_P ) :
+    # solver_P( state ) returns a list of ( side_id, direction ) that solves the state,
+    # played backwards and inverted it builds the state from solved
+    solution = solver_P( tuple( state_P ))
+
+    scramble = []
+    for side_id, direction in reversed( solution ) :
+      scramble.append( ( side_id, 1 - direction ))
+
+    s = STICKER_SOLVED
+    for side_id, direction in scramble :
+      s = RubicsStickers.Apply( s, side_id, direction )
+
+    if s != tuple( state_P ) :
+      raise ValueError( "solver did not solve the state" )
+
+    return scramble
+
+def BenchRandomState( count_P ) :
+  generator = RubicsRandom( 0 )
+
+  start = time.perf_counter()
+  generator.States( count_P )
+  elapsed = time.perf_counter() - start
+  print( "States:      %d states in %.3fs, %.0f states/s" % ( count_P, elapsed, count_P / elapsed ))
+
+  if numpy != None :
+    start = time.perf_counter()
+    generator.StatesArray( count_P )
+    elapsed = time.perf_counter() - start
+    print( "StatesArray: %d states in %.3fs, %.0f states/s" % ( count_P, elapsed, count_P / elapsed ))
+
+#
+# Cube-net renderer.
+#
+# A whole unfolded net is built into one string, and a batch of states into one string, so
+# thousands of states cost one write.  The net is laid out around RED, every face as PrintSide
+# draws it except WHITE, which is turned half way so its RED edge meets RED:
+#
+#         WHITE
+#   GREEN RED   BLUE  ORANGE
+#         YELLOW
+#
+# States are RubicsCube objects or sticker tuples.  RENDER_TEXT uses the color numbers like
+# PrintSide, RENDER_ANSI paints terminal cells, RENDER_SVG draws one image for the whole batch.
+#
+# Stream() never holds more than the buffer limit, SVG included.  The image height is taken from
+# len( states ) when the states have one, else it is written as a fixed width number and written
+# again at the end when the stream can seek.  A generator of states streamed to a socket or pipe
+# is the one case with no height known up front: the header goes out without one, and as an
+# SVG with no height is 150 pixels high by default, a viewer shows only the first state unless
+# the page gives the image its height.  Whether a stream takes str or bytes is read off its mode,
+# then its io base class, and a writer that says neither is tried with str first.
+#
+
+RENDER_TEXT = 0
+RENDER_ANSI = 1
+RENDER_SVG = 2
+
+RENDER_BUFFER_LIMIT = 65536
+
+RENDER_SVG_CELL = 12
+RENDER_SVG_GAP = 12
+RENDER_SVG_DIGITS = 10   # width of the height Stream() fixes up
+
+RENDER_ANSI_COLOR = [ "", "107", "103", "101", "102", "48;5;208", "104" ]
+RENDER_SVG_COLOR = [ "", "#ffffff", "#ffd500", "#b71234", "#009b48", "#ff5800", "#0046ad" ]
+
+class RubicsRender:
+
+  # face -> ( net row, net column ) in face units
+  _NET_FACES = [ None, ( 0, 1 ), ( 2, 1 ), ( 1, 1 ), ( 1, 0 ), ( 1, 3 ), ( 1, 2 ) ]
+
+  _net = None
+
+  def __init__( self, style_P = RENDER_TEXT ) :
+    RubicsStickers._tables_init()
+    RubicsRender._net_init()
+    self._style = style_P
+
+  @staticmethod
+  def _net_init() :
+    if RubicsRender._net != None :
+      return
+
+    # 9 rows of 12 cells, a cell is -1 when empty, 0 .. 47 for a sticker location, 100 + side for a center
+    net = [ [ -1 ] * 12 for row in range( 0, 9 ) ]
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      cells = list( RubicsStickers._face_locs[ side_id ] )
+      cells[ 4 ] = 100 + side_id
+
+      if side_id == CUBE_WHITE :
+        cells.reverse()
+
+      net_row, net_col = RubicsRender._NET_FACES[ side_id ]
+      for i in range( 0, 9 ) :
+        net[ net_row * 3 + i // 3 ][ net_col * 3 + i % 3 ] = cells[ i ]
+
+    RubicsRender._net = tuple( [ tuple( row ) for row in net ] )
+
+  def _colors( self, state_P ) :
+    if isinstance( state_P, RubicsCube ) :
+      return self._cube_colors( state_P )
+
+    loc_face = RubicsStickers._loc_face
+    rows = []
+    for row in RubicsRender._net :
+      colors = []
+      for cell in row :
+        if cell < 0 :
+          colors.append( 0 )
+
+        elif cell >= 100 :
+          colors.append( cell - 100 )
+
+        else :
+          colors.append( loc_face[ state_P[ cell ]] )
+
+      rows.append( colors )
+
+    return rows
+
+  def _cube_colors( self, cube_P ) :
+    # read straight off the cube's faces
+    rows = [ [ 0 ] * 12 for row in range( 0, 9 ) ]
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      stickers = cube_P.FaceStickers( side_id )
+      net_row, net_col = RubicsRender._NET_FACES[ side_id ]
+      for i in range( 0, 9 ) :
+        cell = i
+        if side_id == CUBE_WHITE :
+          cell = 8 - i
+
+        rows[ net_row * 3 + i // 3 ][ net_col * 3 + i % 3 ] = stickers[ cell ]
+
+    return rows
+
+  def _text( self, rows_P ) :
+    lines = []
+    for colors in rows_P :
+      line = " ".join( [ str( color ) if color else " " for color in colors ] )
+      lines.append( line.rstrip() )
+
+    return "\n".join( lines ) + "\n\n"
+
+  def _ansi( self, rows_P ) :
+    lines = []
+    for colors in rows_P :
+      cells = []
+      for color in colors :
+        if color :
+          cells.append( "\x1b[%sm  " % RENDER_ANSI_COLOR[ color ] )
+
+        else :
+          cells.append( "\x1b[0m  " )
+
+      lines.append( "".join( cells ) + "\x1b[0m" )
+
+    return "\n".join( lines ) + "\n\n"
+
+  def _svg( self, rows_P, index_P ) :
+    top = index_P * ( 9 * RENDER_SVG_CELL + RENDER_SVG_GAP )
+    cells = [ '<g transform="translate(0,%d)">' % top ]
+    for y in range( 0, 9 ) :
+      for x in range( 0, 12 ) :
+        color = rows_P[ y ][ x ]
+        if color :
+          cells.append( '<rect x="%d" y="%d" width="%d" height="%d" fill="%s" stroke="#000"/>' % ( x * RENDER_SVG_CELL, y * RENDER_SVG_CELL, RENDER_SVG_CELL, RENDER_SVG_CELL, RENDER_SVG_COLOR[ color ] ))
+
+    cells.append( "</g>\n" )
+    return "".join( cells )
+
+  def _svg_head( self, count_P, digits_P = 0 ) :
+    # no height when count_P is None, zero padded to digits_P so a later head is the same length
+    if count_P == None :
+      return '<svg xmlns="http://www.w3.org/2000/svg" width="%d">\n' % ( 12 * RENDER_SVG_CELL )
+
+    height = count_P * ( 9 * RENDER_SVG_CELL + RENDER_SVG_GAP )
+    return '<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%0*d">\n' % ( 12 * RENDER_SVG_CELL, digits_P, height )
+
+  def _one( self, state_P, index_P ) :
+    rows = self._colors( state_P )
+    if self._style == RENDER_ANSI :
+      return self._ansi( rows )
+
+    elif self._style == RENDER_SVG :
+      return self._svg( rows, index_P )
+
+    return self._text( rows )
+
+  def Net( self, state_P ) :
+    if self._style == RENDER_SVG :
+      return self._svg_head( 1 ) + self._one( state_P, 0 ) + "</svg>\n"
+
+    return self._one( state_P, 0 )
+
+  def Batch( self, states_P ) :
+    states = list( states_P )
+    text = [ self._one( states[ i ], i ) for i in range( 0, len( states )) ]
+
+    if self._style == RENDER_SVG :
+      return self._svg_head( len( states )) + "".join( text ) + "</svg>\n"
+
+    return "".join( text )
+
+  def Stream( self, stream_P, states_P, limit_P = RENDER_BUFFER_LIMIT ) :
+    # at most limit_P characters wait in memory before they are written
+    head = None
+    if self._style == RENDER_SVG :
+      seekable = getattr( stream_P, "seekable", None )
+      if hasattr( states_P, "__len__" ) :
+        _render_write( stream_P, self._svg_head( len( states_P )))
+
+      elif seekable != None and seekable() :
+        head = stream_P.tell()
+        _render_write( stream_P, self._svg_head( 0, RENDER_SVG_DIGITS ))
+
+      else :
+        _render_write( stream_P, self._svg_head( None ))
+
+    buffer = []
+    buffered = 0
+    count = 0
+    for state in states_P :
+      text = self._one( state, count )
+      buffer.append( text )
+      buffered += len( text )
+      count += 1
+
+      if buffered >= limit_P :
+        _render_write( stream_P, "".join( buffer ))
+        buffer = []
+        buffered = 0
+
+    if self._style == RENDER_SVG :
+      buffer.append( "</svg>\n" )
+
+    if buffer :
+      _render_write( stream_P, "".join( buffer ))
+
+    if head != None :
+      stream_P.seek( head )
+      _render_write( stream_P, self._svg_head( count, RENDER_SVG_DIGITS ))
+      stream_P.seek( 0, io.SEEK_END )
+
+    return count
+
+def _render_text_sink( stream_P ) :
+  # 1 when the stream takes str, 0 when it takes bytes, None when it does not say
+  mode = getattr( stream_P, "mode", None )
+  if isinstance( mode, str ) :
+    return int( "b" not in mode )
+
+  if isinstance( stream_P, io.TextIOBase ) :
+    return 1
+
+  if isinstance( stream_P, ( io.BufferedIOBase, io.RawIOBase )) :
+    return 0
+
+  return None
+
+def _render_write( stream_P, text_P ) :
+  # text or bytes, to a socket, a text stream or a binary stream, whatever the stream's class
+  data = text_P
+  if isinstance( text_P, str ) :
+    data = text_P.encode( "utf-8" )
+
+  if hasattr( stream_P, "sendall" ) :
+    stream_P.sendall( data )
+    return
+
+  text_sink = _render_text_sink( stream_P )
+  if isinstance( text_P, str ) :
+    if text_sink == 0 :
+      stream_P.write( data )
+
+    elif text_sink == 1 :
+      stream_P.write( text_P )
+
+    else :
+      # a writer that does not say, str first
+      try :
+        stream_P.write( text_P )
+
+      except TypeError :
+        stream_P.write( data )
+
+  elif text_sink == 1 :
+    if not hasattr( stream_P, "buffer" ) :
+      raise TypeError( "bytes cannot be written to %s, it is a text stream with no binary buffer" % type( stream_P ).__name__ )
+
+    # text still waiting in the text layer goes first
+    stream_P.flush()
+    stream_P.buffer.write( data )
+
+  else :
+    stream_P.write( data )
+
+class _RenderPipe:
+  # a text writer with no mode, no io base class and no seek, like a pipe wrapper
+  def __init__( self ) :
+    self._parts = []
+
+  def write( self, text_P ) :
+    if not isinstance( text_P, str ) :
+      raise TypeError( "write() argument must be str" )
+
+    self._parts.append( text_P )
+
+  def Text( self ) :
+    return "".join( self._parts )
+
+RENDER_TEST_SOLVED = "      1 1 1\n      1 1 1\n      1 1 1\n" + "4 4 4 3 3 3 6 6 6 5 5 5\n" * 3 + "      2 2 2\n      2 2 2\n      2 2 2\n\n"
+RENDER_TEST_RED = "      1 1 1\n      1 1 1\n      4 4 4\n" + "4 4 2 3 3 3 1 6 6 5 5 5\n" * 3 + "      6 6 6\n      2 2 2\n      2 2 2\n\n"
+
+def TestRender() :
+  # nets against known text, cubes against sticker states, and Stream() to every kind of sink
+  # against Batch()
+  failures = 0
+  checks = []
+
+  turned = RubicsCube()
+  turned.RotateSide( CUBE_RED, ROTATE_CLOCKWISE )
+  text = RubicsRender()
+  checks.append( ( "text solved", text.Net( RubicsCube() ), RENDER_TEST_SOLVED ))
+  checks.append( ( "text RED", text.Net( turned ), RENDER_TEST_RED ))
+  checks.append( ( "text stickers", text.Net( RubicsStickers.FromLayers( turned._cube )), RENDER_TEST_RED ))
+  checks.append( ( "ansi row", RubicsRender( RENDER_ANSI ).Net( RubicsCube() ).split( "\n" )[ 0 ], "\x1b[0m  " * 3 + "\x1b[107m  " * 3 + "\x1b[0m  " * 6 + "\x1b[0m" ))
+
+  svg = RubicsRender( RENDER_SVG )
+  states = [ RubicsCube(), turned, RubicsStickers.FromLayers( turned._cube ) ]
+  batch = svg.Batch( states )
+  head = svg._svg_head( len( states ))
+  body = batch[ len( head ) : ]
+  checks.append( ( "svg height", head, '<svg xmlns="http://www.w3.org/2000/svg" width="144" height="%d">\n' % ( 3 * ( 9 * RENDER_SVG_CELL + RENDER_SVG_GAP )) ))
+
+  sink = io.StringIO()
+  svg.Stream( sink, states, 1 )
+  checks.append( ( "stream list", sink.getvalue(), batch ))
+
+  sink = io.StringIO()
+  svg.Stream( sink, iter( states ))
+  checks.append( ( "stream seek", sink.getvalue(), svg._svg_head( len( states ), RENDER_SVG_DIGITS ) + body ))
+
+  sink = _RenderPipe()
+  svg.Stream( sink, iter( states ))
+  checks.append( ( "stream pipe", sink.Text(), svg._svg_head( None ) + body ))
+
+  sink = io.BytesIO()
+  svg.Stream( sink, states )
+  checks.append( ( "stream bytes", sink.getvalue().decode( "utf-8" ), batch ))
+
+  with tempfile.NamedTemporaryFile( "w+" ) as sink :
+    svg.Stream( sink, iter( states ))
+    sink.seek( 0 )
+    checks.append( ( "stream temp file", sink.read(), svg._svg_head( len( states ), RENDER_SVG_DIGITS ) + body ))
+
+  for name, found, expected in checks :
+    if found != expected :
+      print( "\tRENDER MISMATCH ****************** %s %r" % ( name, found[ : 80 ] ))
+      failures += 1
+
+  print( "Render: %d checks, %d mismatches" % ( len( checks ), failures ))
+  assert failures == 0
+
+#
+# Algorithm analysis.
+#
+# A move list is folded once into its sticker permutation.  Everything else is read off the
+# permutation's cycles without replaying moves: the corner and edge cycles with the twist or flip
+# a piece picks up going around its cycle, the order (repeats until solved), the result of k
+# repeats and the inverse.
+#
+
+class RubicsAlgorithm:
+
+  def __init__( self, moves_P ) :
+    RubicsStickers._tables_init()
+
+    self._moves = list( moves_P )
+
+    s = STICKER_SOLVED
+    for side_id, direction in self._moves :
+      s = RubicsStickers.Apply( s, side_id, direction )
+
+    self._s = s
+    self._cycles = None
+
+  def Stickers( self ) :
+    return self._s
+
+  def _sticker_cycles( self ) :
+    if self._cycles == None :
+      cycles = []
+      seen = [ 0 ] * STICKER_COUNT
+      for loc in range( 0, STICKER_COUNT ) :
+        if seen[ loc ] == 0 :
+          cycle = []
+          while seen[ loc ] == 0 :
+            seen[ loc ] = 1
+            cycle.append( loc )
+            loc = self._s[ loc ]
+
+          cycles.append( tuple( cycle ))
+
+      self._cycles = cycles
+
+    return self._cycles
+
+  def Cycles( self ) :
+    # ( corner cycles, edge cycles ), a cycle is ( positions, twist or flip ), fixed pieces left out
+    cp, co, ep, eo = RubicsStickers.ToCubies( self._s )
+
+    corners = _piece_cycles( cp, co, 3 )
+    edges = _piece_cycles( ep, eo, 2 )
+    return corners, edges
+
+  def Order( self ) :
+    order = 1
+    for cycle in self._sticker_cycles() :
+      order = order * len( cycle ) // math.gcd( order, len( cycle ))
+
+    return order
+
+  def Power( self, k_P ) :
+    # the permutation of k_P repeats, each sticker steps k_P places along its cycle
+    s = [ 0 ] * STICKER_COUNT
+    for cycle in self._sticker_cycles() :
+      length = len( cycle )
+      for i in range( 0, length ) :
+        s[ cycle[ i ]] = cycle[ ( i + k_P ) % length ]
+
+    return tuple( s )
+
+  def ApplyPower( self, stickers_P, k_P ) :
+    return tuple( [ stickers_P[ i ] for i in self.Power( k_P ) ] )
+
+  def Inverse( self ) :
+    s = [ 0 ] * STICKER_COUNT
+    for loc in range( 0, STICKER_COUNT ) :
+      s[ self._s[ loc ]] = loc
+
+    return tuple( s )
+
+  def InverseMoves( self ) :
+    return [ ( side_id, 1 - direction ) for side_id, direction in reversed( self._moves ) ]
+
+def _piece_cycles( perm_P, orientation_P, modulo_P ) :
+  cycles = []
+  seen = [ 0 ] * len( perm_P )
+  for start in range( 0, len( perm_P )) :
+    if seen[ start ] == 0 :
+      positions = []
+      twist = 0
+      position = start
+      while seen[ position ] == 0 :
+        seen[ position ] = 1
+        positions.append( position )
+        twist += orientation_P[ position ]
+        position = perm_P[ position ]
+
+      twist %= modulo_P
+      if len( positions ) > 1 or twist != 0 :
+        cycles.append( ( tuple( positions ), twist ))
+
+  return cycles
+
+def TestAlgorithm( count_P, length_P ) :
+  # Order(), Power( k ) and Inverse() against the moves played again and again
+  rnd = random.Random( 0 )
+  failures = 0
+  repeats = 0
+  for i in range( 0, count_P ) :
+    moves = [ ( rnd.randint( CUBE_WHITE, CUBE_BLUE ), rnd.randint( ROTATE_CLOCKWISE, ROTATE_COUNTER )) for m in range( 0, length_P ) ]
+    algorithm = RubicsAlgorithm( moves )
+    order = algorithm.Order()
+
+    s = STICKER_SOLVED
+    for k in range( 1, order + 1 ) :
+      for side_id, direction in moves :
+        s = RubicsStickers.Apply( s, side_id, direction )
+
+      if algorithm.Power( k ) != s or algorithm.ApplyPower( STICKER_SOLVED, k ) != s or ( s == STICKER_SOLVED ) != ( k == order ) :
+        print( "\tALGORITHM MISMATCH ****************** moves %s repeat %d order %d" % ( moves, k, order ))
+        failures += 1
+        break
+
+    repeats += order
+
+    s = algorithm.Stickers()
+    for side_id, direction in algorithm.InverseMoves() :
+      s = RubicsStickers.Apply( s, side_id, direction )
+
+    if s != STICKER_SOLVED or algorithm.ApplyPower( algorithm.Inverse(), 1 ) != STICKER_SOLVED :
+      print( "\tALGORITHM INVERSE MISMATCH ****************** moves %s" % ( moves, ))
+      failures += 1
+
+  print( "Algorithm: %d algorithms of %d moves, %d repeats played, %d mismatches" % ( count_P, length_P, repeats, failures ))
+  assert failures == 0
+
+#
+# Zobrist hashing.
+#
+# Every ( piece, position, orientation ) has a random 64 bit key.  The piece and orientation at a
+# position are given by the sticker on the position's reference face, so a key is looked up by
+# ( reference location, sticker ) and a state hashes to the XOR of its 20 keys.  A quarter turn
+# moves the 8 pieces of one face, so a hash is updated by XOR-ing out their keys before the move
+# and XOR-ing in their keys after it.
+#
+
+ZOBRIST_SEED = 20200223
+
+TABLE_REPLACE_DEPTH = 0
+TABLE_REPLACE_ALWAYS = 1
+
+TABLE_SIZE = 1 << 20
+
+class RubicsZobrist:
+
+  _keys = None          # reference location -> sticker -> key
+  _refs = None          # reference locations of all 20 positions
+  _side_refs = None     # side_id -> reference locations of the 8 positions on the face
+
+  @staticmethod
+  def _tables_init() :
+    if RubicsZobrist._keys != None :
+      return
+
+    RubicsStickers._tables_init()
+
+    with _TABLES_LOCK :
+      if RubicsZobrist._keys == None :
+        RubicsZobrist._tables_build()
+
+  @staticmethod
+  def _tables_build() :
+    refs = [ loc for loc in range( 0, STICKER_COUNT ) if RubicsStickers._loc_first[ loc ] ]
+
+    rnd = random.Random( ZOBRIST_SEED )
+    keys = [ None ] * STICKER_COUNT
+    for ref in refs :
+      keys[ ref ] = tuple( [ rnd.getrandbits( 64 ) for sticker in range( 0, STICKER_COUNT ) ] )
+
+    side_refs = [ None ]
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      slots = [ RubicsStickers._loc_slot[ loc ] for loc in RubicsStickers._face_locs[ side_id ] if loc != None ]
+      side_refs.append( tuple( [ ref for ref in refs if RubicsStickers._loc_slot[ ref ] in slots ] ))
+
+    RubicsZobrist._refs = tuple( refs )
+    RubicsZobrist._side_refs = tuple( side_refs )
+    RubicsZobrist._keys = tuple( keys )
+
+  @staticmethod
+  def HashStickers( stickers_P ) :
+    RubicsZobrist._tables_init()
+
+    keys = RubicsZobrist._keys
+    h = 0
+    for ref in RubicsZobrist._refs :
+      h ^= keys[ ref ][ stickers_P[ ref ]]
+
+    return h
+
+  @staticmethod
+  def MoveStickers( hash_P, stickers_P, side_id_P, direction_P ) :
+    # ( new hash, new stickers ), only the keys of the turned face are touched
+    RubicsZobrist._tables_init()
+    keys = RubicsZobrist._keys
+    s = RubicsStickers.Apply( stickers_P, side_id_P, direction_P )
+
+    h = hash_P
+    for ref in RubicsZobrist._side_refs[ side_id_P ] :
+      h ^= keys[ ref ][ stickers_P[ ref ]] ^ keys[ ref ][ s[ ref ]]
+
+    return h, s
+
+  @staticmethod
+  def _layers_key( layers_P, ref_P ) :
+    layer, slot = RubicsStickers._loc_slot[ ref_P ]
+    piece = layers_P[ layer ][ slot ]
+    face = RubicsStickers._loc_face[ ref_P ]
+
+    if piece[ CUBE_TYPE ] == CUBE_CORNER :
+      base = RubicsStickers._piece_base[ tuple( piece[ CUBE_CORNER_0 : CUBE_CORNER_2 + 1 ] ) ]
+      count = 3
+
+    else :
+      base = RubicsStickers._piece_base[ tuple( piece[ CUBE_EDGE_0 : CUBE_EDGE_1 + 1 ] ) ]
+      count = 2
+
+    for sticker in range( base, base + count ) :
+      if piece[ RubicsStickers._sticker_field[ sticker ]] == face :
+        return RubicsZobrist._keys[ ref_P ][ sticker ]
+
+    LOG.Error( "no sticker on face %d", face )
+    exit()
+
+  @staticmethod
+  def HashLayers( layers_P ) :
+    RubicsZobrist._tables_init()
+
+    h = 0
+    for ref in RubicsZobrist._refs :
+      h ^= RubicsZobrist._layers_key( layers_P, ref )
+
+    return h
+
+  @staticmethod
+  def SideLayers( layers_P, side_id_P ) :
+    # XOR of the keys of the 8 pieces on a face, RotateSide applies it before and after the move
+    RubicsZobrist._tables_init()
+    h = 0
+    for ref in RubicsZobrist._side_refs[ side_id_P ] :
+      h ^= RubicsZobrist._layers_key( layers_P, ref )
+
+    return h
+
+#
+# Transposition table.
+#
+# A fixed number of slots indexed by the low bits of the hash.  Each slot keeps the full hash, the
+# search depth the entry came from and the best known lower bound on the distance to solved.  On a
+# collision TABLE_REPLACE_DEPTH keeps the entry searched deeper, TABLE_REPLACE_ALWAYS keeps the
+# newest.  A slot's key, depth and bound are written one after the other and the counters bumped
+# with no lock, so a table must not be shared between threads without one.
+#
+
+class RubicsTable:
+
+  def __init__( self, size_P = TABLE_SIZE, policy_P = TABLE_REPLACE_DEPTH ) :
+    size = 1
+    while size < size_P :
+      size <<= 1
+
+    self._size = size
+    self._mask = size - 1
+    self._policy = policy_P
+
+    self._keys = array.array( "Q", bytes( 8 * size ))
+    self._depth = array.array( "b", [ -1 ] ) * size
+    self._bound = array.array( "B", bytes( size ))
+
+    self._probes = 0
+    self._hits = 0
+    self._stores = 0
+    self._replaced = 0
+    self._rejected = 0
+    self._used = 0
+
+  def Probe( self, hash_P ) :
+    # the stored bound, -1 when the state is not in the table
+    self._probes += 1
+
+    i = hash_P & self._mask
+    if self._depth[ i ] >= 0 and self._keys[ i ] == hash_P :
+      self._hits += 1
+      return self._bound[ i ]
+
+    return -1
+
+  def Store( self, hash_P, depth_P, bound_P ) :
+    self._stores += 1
+
+    i = hash_P & self._mask
+    if self._depth[ i ] < 0 :
+      self._used += 1
+
+    elif self._keys[ i ] == hash_P :
+      # same state, keep the tighter bound and the deeper search
+      if bound_P < self._bound[ i ] :
+        bound_P = self._bound[ i ]
+
+      if depth_P < self._depth[ i ] :
+        depth_P = self._depth[ i ]
+
+    elif self._policy == TABLE_REPLACE_DEPTH and depth_P < self._depth[ i ] :
+      self._rejected += 1
+      return
+
+    else :
+      self._replaced += 1
+
+    self._keys[ i ] = hash_P
+    self._depth[ i ] = depth_P
+    self._bound[ i ] = bound_P
+
+  def Clear( self ) :
+    self.__init__( self._size, self._policy )
+
+  def Stats( self ) :
+    hit_rate = 0.0
+    if self._probes :
+      hit_rate = self._hits / self._probes
+
+    memory = len( self._keys ) * self._keys.itemsize + len( self._depth ) * self._depth.itemsize + len( self._bound ) * self._bound.itemsize
+
+    return { "size" : self._size, "used" : self._used, "probes" : self._probes, "hits" : self._hits, "hit_rate" : hit_rate,
+             "stores" : self._stores, "replaced" : self._replaced, "rejected" : self._rejected, "bytes" : memory }
+
+def TestZobrist( moves_P ) :
+  # the hash RotateSide keeps and the one MoveStickers keeps against hashing the state from scratch
+  rnd = random.Random( 0 )
+  cube = RubicsCube()
+  cube.HashEnable()
+  s = STICKER_SOLVED
+  h = RubicsZobrist.HashStickers( s )
+
+  failures = 0
+  for step in range( 0, moves_P ) :
+    side_id = rnd.randint( CUBE_WHITE, CUBE_BLUE )
+    direction = rnd.randint( ROTATE_CLOCKWISE, ROTATE_COUNTER )
+    cube.RotateSide( side_id, direction )
+    h, s = RubicsZobrist.MoveStickers( h, s, side_id, direction )
+
+    stickers = RubicsStickers.FromLayers( cube._cube )
+    if cube.Hash() != RubicsZobrist.HashLayers( cube._cube ) or cube.Hash() != RubicsZobrist.HashStickers( stickers ) or h != RubicsZobrist.HashStickers( s ) or s != stickers :
+      print( "\tZOBRIST MISMATCH ****************** step %d move %d %d" % ( step, side_id, direction ))
+      failures += 1
+      break
+
+  print( "Zobrist: %d moves, %d mismatches" % ( moves_P, failures ))
+  assert failures == 0
+
+#
+# Facelet strings.
+#
+# A cube is 54 characters, 9 per face in the order U R F D L B, each face read row by row as seen
+# from outside with U drawn with F below it and D with F above it.  The cube's orientation is
+#     U WHITE, R BLUE, F RED, D YELLOW, L GREEN, B ORANGE
+# so R, F, D, L and B read like PrintSide, U is WHITE turned half way.  Any 6 symbols may be used,
+# the centers say which symbol is which color.
+#
+# Corner and edge positions are read through lookup tables from their color triples/pairs to the
+# stickers of the piece and its orientation.  Bad input raises RubicsFaceletError with a code and
+# the facelet, position or row at fault.
+#
+
+FACELET_COUNT = 54
+FACELET_FACES = "URFDLB"
+FACELET_SIDES = [ CUBE_WHITE, CUBE_BLUE, CUBE_RED, CUBE_YELLOW, CUBE_GREEN, CUBE_ORANGE ]
+FACELET_CENTERS = [ 4, 13, 22, 31, 40, 49 ]
+
+FACELET_BULK_CHUNK = 65536
+
+FACELET_ERROR_LENGTH = 1
+FACELET_ERROR_CENTER = 2
+FACELET_ERROR_SYMBOL = 3
+FACELET_ERROR_COUNT = 4
+FACELET_ERROR_CORNER = 5
+FACELET_ERROR_EDGE = 6
+FACELET_ERROR_DUPLICATE = 7
+FACELET_ERROR_TWIST = 8
+FACELET_ERROR_FLIP = 9
+FACELET_ERROR_PARITY = 10
+
+FACELET_ERROR_NAMES = [ "", "length", "center", "symbol", "count", "corner", "edge", "duplicate", "twist", "flip", "parity" ]
+
+class RubicsFaceletError( ValueError ) :
+
+  def __init__( self, code_P, index_P = -1, message_P = "" ) :
+    self.code = code_P
+    self.index = index_P
+    self.row = -1
+    ValueError.__init__( self, "facelets %s error at %d %s" % ( FACELET_ERROR_NAMES[ code_P ], index_P, message_P ))
+
+class RubicsFacelets:
+
+  _loc_facelet = None   # loc -> facelet
+  _facelet_loc = None   # facelet -> loc, None for centers
+  _corner_lookup = None # colors on faces 0, 1, 2 of a corner position -> stickers
+  _edge_lookup = None   # colors on faces 0, 1 of an edge position -> stickers
+
+  @staticmethod
+  def _tables_init() :
+    if RubicsFacelets._loc_facelet != None :
+      return
+
+    RubicsStickers._tables_init()
+
+    with _TABLES_LOCK :
+      if RubicsFacelets._loc_facelet == None :
+        RubicsFacelets._tables_build()
+
+  @staticmethod
+  def _tables_build() :
+
+    facelet_loc = []
+    for side_id in FACELET_SIDES :
+      locs = list( RubicsStickers._face_locs[ side_id ] )
+      if side_id == CUBE_WHITE :
+        locs.reverse()
+
+      facelet_loc.extend( locs )
+
+    loc_facelet = [ 0 ] * STICKER_COUNT
+    for facelet in range( 0, FACELET_COUNT ) :
+      if facelet_loc[ facelet ] != None :
+        loc_facelet[ facelet_loc[ facelet ]] = facelet
+
+    loc_face = RubicsStickers._loc_face
+
+    corner_lookup = {}
+    for stickers in RubicsStickers._corner_stickers :
+      corner_lookup[ tuple( [ loc_face[ sticker ] for sticker in stickers ] ) ] = stickers
+
+    edge_lookup = {}
+    for stickers in RubicsStickers._edge_stickers :
+      edge_lookup[ tuple( [ loc_face[ sticker ] for sticker in stickers ] ) ] = stickers
+
+    RubicsFacelets._facelet_loc = tuple( facelet_loc )
+    RubicsFacelets._corner_lookup = corner_lookup
+    RubicsFacelets._edge_lookup = edge_lookup
+    RubicsFacelets._loc_facelet = tuple( loc_facelet )
+
+  @staticmethod
+  def ToFacelets( state_P, faces_P = FACELET_FACES ) :
+    RubicsFacelets._tables_init()
+
+    if isinstance( state_P, RubicsCube ) :
+      state_P = RubicsStickers.FromLayers( state_P._cube )
+
+    symbol = [ None ] * ( CUBE_BLUE + 1 )
+    for i in range( 0, 6 ) :
+      symbol[ FACELET_SIDES[ i ]] = faces_P[ i ]
+
+    loc_face = RubicsStickers._loc_face
+    text = []
+    for facelet in range( 0, FACELET_COUNT ) :
+      loc = RubicsFacelets._facelet_loc[ facelet ]
+      if loc == None :
+        text.append( faces_P[ facelet // 9 ] )
+
+      else :
+        text.append( symbol[ loc_face[ state_P[ loc ]]] )
+
+    return "".join( text )
+
+  @staticmethod
+  def FromFacelets( text_P ) :
+    RubicsFacelets._tables_init()
+
+    if len( text_P ) != FACELET_COUNT :
+      raise RubicsFaceletError( FACELET_ERROR_LENGTH, len( text_P ), "expected %d facelets" % FACELET_COUNT )
+
+    side = {}
+    for i in range( 0, 6 ) :
+      center = text_P[ FACELET_CENTERS[ i ]]
+      if center in side :
+        raise RubicsFaceletError( FACELET_ERROR_CENTER, FACELET_CENTERS[ i ], "center %s repeated" % center )
+
+      side[ center ] = FACELET_SIDES[ i ]
+
+    colors = []
+    for facelet in range( 0, FACELET_COUNT ) :
+      if text_P[ facelet ] not in side :
+        raise RubicsFaceletError( FACELET_ERROR_SYMBOL, facelet, "symbol %s is no center" % text_P[ facelet ] )
+
+      colors.append( side[ text_P[ facelet ]] )
+
+    for symbol in side :
+      if text_P.count( symbol ) != 9 :
+        raise RubicsFaceletError( FACELET_ERROR_COUNT, text_P.index( symbol ), "symbol %s %d times" % ( symbol, text_P.count( symbol )))
+
+    loc_facelet = RubicsFacelets._loc_facelet
+    s = []
+    for k in range( 0, STICKER_CORNERS ) :
+      key = ( colors[ loc_facelet[ 3 * k ]], colors[ loc_facelet[ 3 * k + 1 ]], colors[ loc_facelet[ 3 * k + 2 ]] )
+      if key not in RubicsFacelets._corner_lookup :
+        raise RubicsFaceletError( FACELET_ERROR_CORNER, k, "no corner has colors %s" % ( key, ))
+
+      s.extend( RubicsFacelets._corner_lookup[ key ] )
+
+    for e in range( 0, STICKER_EDGES ) :
+      loc = STICKER_EDGE_BASE + 2 * e
+      key = ( colors[ loc_facelet[ loc ]], colors[ loc_facelet[ loc + 1 ]] )
+      if key not in RubicsFacelets._edge_lookup :
+        raise RubicsFaceletError( FACELET_ERROR_EDGE, e, "no edge has colors %s" % ( key, ))
+
+      s.extend( RubicsFacelets._edge_lookup[ key ] )
+
+    cp, co, ep, eo = RubicsStickers.ToCubies( s )
+    for perm, count in ( ( cp, STICKER_CORNERS ), ( ep, STICKER_EDGES )) :
+      if sorted( perm ) != list( range( 0, count )) :
+        position = [ i for i in range( 0, count ) if perm.count( perm[ i ] ) > 1 ][ 0 ]
+        raise RubicsFaceletError( FACELET_ERROR_DUPLICATE, position, "piece %d repeated" % perm[ position ] )
+
+    if sum( co ) % 3 != 0 :
+      raise RubicsFaceletError( FACELET_ERROR_TWIST, -1, "corner twist %d" % ( sum( co ) % 3 ))
+
+    if sum( eo ) % 2 != 0 :
+      raise RubicsFaceletError( FACELET_ERROR_FLIP, -1, "edge flip" )
+
+    if _permutation_parity( cp ) != _permutation_parity( ep ) :
+      raise RubicsFaceletError( FACELET_ERROR_PARITY, -1, "corner and edge parity differ" )
+
+    return tuple( s )
+
+  @staticmethod
+  def FromFaceletsBulk( texts_P ) :
+    # ( states, errors ), a bytearray of STICKER_COUNT bytes per state, errors is a list of
+    # ( row, code ) with the codes of FromFacelets, and the state of a bad row is left zero
+    RubicsFacelets._tables_init()
+
+    texts = list( texts_P )
+    if numpy != None :
+      return RubicsFacelets._bulk_numpy( texts )
+
+    return RubicsFacelets._bulk_python( texts )
+
+  @staticmethod
+  def _bulk_python( texts_P ) :
+    states = bytearray( len( texts_P ) * STICKER_COUNT )
+    errors = []
+    for row in range( 0, len( texts_P )) :
+      try :
+        states[ row * STICKER_COUNT : ( row + 1 ) * STICKER_COUNT ] = RubicsFacelets.FromFacelets( texts_P[ row ] )
+
+      except RubicsFaceletError as error :
+        errors.append( ( row, error.code ))
+
+    return states, errors
+
+  @staticmethod
+  def _bulk_numpy( texts_P ) :
+    # filled through a view, so the result is the same bytearray as _bulk_python's
+    count = len( texts_P )
+    buffer = bytearray( count * STICKER_COUNT )
+    states = numpy.frombuffer( buffer, dtype = numpy.uint8 ).reshape( count, STICKER_COUNT )
+    codes = numpy.zeros( count, dtype = numpy.uint8 )
+
+    # color triples/pairs packed 3 bits per color -> index into the piece tables, 255 for none
+    corner_index = numpy.full( 512, 255, dtype = numpy.uint8 )
+    for key, stickers in RubicsFacelets._corner_lookup.items() :
+      corner_index[ key[ 0 ] * 64 + key[ 1 ] * 8 + key[ 2 ]] = RubicsStickers._corner_stickers.index( stickers )
+
+    edge_index = numpy.full( 64, 255, dtype = numpy.uint8 )
+    for key, stickers in RubicsFacelets._edge_lookup.items() :
+      edge_index[ key[ 0 ] * 8 + key[ 1 ]] = RubicsStickers._edge_stickers.index( stickers )
+
+    corner_stickers = numpy.array( RubicsStickers._corner_stickers, dtype = numpy.uint8 )
+    edge_stickers = numpy.array( RubicsStickers._edge_stickers, dtype = numpy.uint8 )
+    sides = numpy.array( FACELET_SIDES, dtype = numpy.uint8 )
+    corner_facelets = numpy.array( RubicsFacelets._loc_facelet[ : STICKER_EDGE_BASE ] ).reshape( STICKER_CORNERS, 3 )
+    edge_facelets = numpy.array( RubicsFacelets._loc_facelet[ STICKER_EDGE_BASE : ] ).reshape( STICKER_EDGES, 2 )
+
+    for start in range( 0, count, FACELET_BULK_CHUNK ) :
+      texts = texts_P[ start : start + FACELET_BULK_CHUNK ]
+      rows = len( texts )
+      code = numpy.zeros( rows, dtype = numpy.uint8 )
+
+      lengths = numpy.array( [ len( text ) for text in texts ] )
+      good = lengths == FACELET_COUNT
+      code[ ~good ] = FACELET_ERROR_LENGTH
+
+      # bytes when every symbol fits, code points otherwise, so any symbol FromFacelets takes is
+      # taken here too
+      text = "".join( [ texts[ i ] if good[ i ] else "?" * FACELET_COUNT for i in range( 0, rows ) ] )
+      try :
+        chars = numpy.frombuffer( text.encode( "latin-1" ), dtype = numpy.uint8 ).reshape( rows, FACELET_COUNT )
+
+      except UnicodeEncodeError :
+        chars = numpy.frombuffer( text.encode( "utf-32-le" ), dtype = numpy.uint32 ).reshape( rows, FACELET_COUNT )
+
+      centers = chars[ :, FACELET_CENTERS ]
+      repeated = ( centers[ :, :, None ] == centers[ :, None, : ] ).sum( axis = ( 1, 2 )) != 6
+      code[ ( code == 0 ) & repeated ] = FACELET_ERROR_CENTER
+
+      # the color of every facelet, 0 for symbols that are no center, through a symbol -> color
+      # table per row when the symbols are bytes
+      if chars.dtype == numpy.uint8 :
+        index = numpy.arange( rows )[ :, None ]
+        table = numpy.zeros( ( rows, 256 ), dtype = numpy.uint8 )
+        table[ index, centers ] = sides
+        colors = table[ index, chars ]
+
+      else :
+        colors = numpy.zeros( ( rows, FACELET_COUNT ), dtype = numpy.uint8 )
+        for i in range( 0, 6 ) :
+          colors[ chars == centers[ :, i : i + 1 ]] = FACELET_SIDES[ i ]
+
+      code[ ( code == 0 ) & ( colors == 0 ).any( axis = 1 ) ] = FACELET_ERROR_SYMBOL
+
+      miscounted = numpy.zeros( rows, dtype = bool )
+      for side_id in FACELET_SIDES :
+        miscounted |= ( colors == side_id ).sum( axis = 1, dtype = numpy.uint8 ) != 9
+
+      code[ ( code == 0 ) & miscounted ] = FACELET_ERROR_COUNT
+      colors = colors.astype( numpy.intp )
+
+      corner = corner_index[ colors[ :, corner_facelets[ :, 0 ]] * 64 + colors[ :, corner_facelets[ :, 1 ]] * 8 + colors[ :, corner_facelets[ :, 2 ]] ]
+      code[ ( code == 0 ) & ( corner == 255 ).any( axis = 1 ) ] = FACELET_ERROR_CORNER
+
+      edge = edge_index[ colors[ :, edge_facelets[ :, 0 ]] * 8 + colors[ :, edge_facelets[ :, 1 ]] ]
+      code[ ( code == 0 ) & ( edge == 255 ).any( axis = 1 ) ] = FACELET_ERROR_EDGE
+
+      corner[ corner == 255 ] = 0
+      edge[ edge == 255 ] = 0
+      cp = corner // 3
+      ep = edge // 2
+
+      duplicate = ( numpy.sort( cp, axis = 1 ) != numpy.arange( STICKER_CORNERS )).any( axis = 1 ) | ( numpy.sort( ep, axis = 1 ) != numpy.arange( STICKER_EDGES )).any( axis = 1 )
+      code[ ( code == 0 ) & duplicate ] = FACELET_ERROR_DUPLICATE
+      code[ ( code == 0 ) & ( ( corner % 3 ).sum( axis = 1 ) % 3 != 0 ) ] = FACELET_ERROR_TWIST
+      code[ ( code == 0 ) & ( ( edge % 2 ).sum( axis = 1 ) % 2 != 0 ) ] = FACELET_ERROR_FLIP
+      code[ ( code == 0 ) & ( _numpy_permutation_parity( cp ) != _numpy_permutation_parity( ep )) ] = FACELET_ERROR_PARITY
+
+      block = numpy.empty( ( rows, STICKER_COUNT ), dtype = numpy.uint8 )
+      block[ :, : STICKER_EDGE_BASE ] = corner_stickers[ corner ].reshape( rows, STICKER_EDGE_BASE )
+      block[ :, STICKER_EDGE_BASE : ] = edge_stickers[ edge ].reshape( rows, STICKER_COUNT - STICKER_EDGE_BASE )
+      block[ code != 0 ] = 0
+
+      states[ start : start + rows ] = block
+      codes[ start : start + rows ] = code
+
+    errors = [ ( int( row ), int( codes[ row ] )) for row in numpy.nonzero( codes )[ 0 ] ]
+    return buffer, errors
+
+def _facelets_swap( text_P, loc_a_P, loc_b_P ) :
+  text = list( text_P )
+  a = RubicsFacelets._loc_facelet[ loc_a_P ]
+  b = RubicsFacelets._loc_facelet[ loc_b_P ]
+  text[ a ], text[ b ] = text[ b ], text[ a ]
+  return "".join( text )
+
+def TestFacelets( count_P ) :
+  # round trips of random states, and one bad string per error code, through FromFacelets and
+  # every bulk path
+  RubicsFacelets._tables_init()
+  generator = RubicsRandom( 0 )
+  failures = 0
+
+  states = [ generator.State() for i in range( 0, count_P ) ]
+  texts = [ RubicsFacelets.ToFacelets( state ) for state in states ]
+  for i in range( 0, count_P ) :
+    if RubicsFacelets.FromFacelets( texts[ i ] ) != states[ i ] or RubicsFacelets.ToFacelets( RubicsFacelets.FromFacelets( texts[ i ] ), "ABCDEF" ) != texts[ i ].translate( str.maketrans( FACELET_FACES, "ABCDEF" )) :
+      print( "\tFACELETS ROUND TRIP MISMATCH ****************** %s" % texts[ i ] )
+      failures += 1
+
+  cube = RubicsCube()
+  cube.FromFacelets( texts[ 0 ] )
+  if RubicsFacelets.ToFacelets( cube ) != texts[ 0 ] :
+    print( "\tFACELETS CUBE ROUND TRIP MISMATCH ****************** %s" % texts[ 0 ] )
+    failures += 1
+
+  solved = RubicsFacelets.ToFacelets( STICKER_SOLVED )
+  cp, co, ep, eo = RubicsStickers.ToCubies( STICKER_SOLVED )
+  bad = [ ( FACELET_ERROR_LENGTH, solved[ : -1 ] ),
+          ( FACELET_ERROR_CENTER, solved[ : FACELET_CENTERS[ 1 ]] + "U" + solved[ FACELET_CENTERS[ 1 ] + 1 : ] ),
+          ( FACELET_ERROR_SYMBOL, "X" + solved[ 1 : ] ),
+          ( FACELET_ERROR_COUNT, "R" + solved[ 1 : ] ),
+          ( FACELET_ERROR_CORNER, _facelets_swap( solved, 0, 1 )),                                # a corner turned inside out
+          ( FACELET_ERROR_EDGE, _facelets_swap( solved, STICKER_EDGE_BASE, STICKER_EDGE_BASE + 3 )),       # an edge of one color
+          ( FACELET_ERROR_DUPLICATE, _facelets_swap( solved, STICKER_EDGE_BASE, STICKER_EDGE_BASE + 11 )), # two good edges, one there twice
+          ( FACELET_ERROR_TWIST, RubicsFacelets.ToFacelets( RubicsStickers.FromCubies( cp, [ 1 ] + co[ 1 : ], ep, eo ))),
+          ( FACELET_ERROR_FLIP, RubicsFacelets.ToFacelets( RubicsStickers.FromCubies( cp, co, ep, [ 1 ] + eo[ 1 : ] ))),
+          ( FACELET_ERROR_PARITY, RubicsFacelets.ToFacelets( RubicsStickers.FromCubies( cp, co, [ ep[ 1 ], ep[ 0 ]] + ep[ 2 : ], eo ))) ]
+
+  expected = []
+  for code, text in bad :
+    try :
+      RubicsFacelets.FromFacelets( text )
+      found = 0
+
+    except RubicsFaceletError as error :
+      found = error.code
+
+    if found != code :
+      print( "\tFACELETS ERROR MISMATCH ****************** expected %s got %s" % ( FACELET_ERROR_NAMES[ code ], FACELET_ERROR_NAMES[ found ] ))
+      failures += 1
+
+    expected.append( ( count_P + len( expected ), code ))
+
+  bulks = [ RubicsFacelets._bulk_python ]
+  if numpy != None :
+    bulks.append( RubicsFacelets._bulk_numpy )
+
+  packed = bytearray().join( [ bytes( state ) for state in states ] ) + bytes( len( bad ) * STICKER_COUNT )
+  for bulk in bulks :
+    result, errors = bulk( texts + [ text for code, text in bad ] )
+    if type( result ) != bytearray or result != packed or errors != expected :
+      print( "\tFACELETS BULK MISMATCH ****************** %s errors %s" % ( bulk.__name__, errors ))
+      failures += 1
+
+  print( "Facelets: %d round trips, %d error codes, %d bulk paths, %d mismatches" % ( count_P, len( bad ), len( bulks ), failures ))
+  assert failures == 0
+
+#
+# Peephole shortener.
+#
+# Shorten() first merges each run of moves on one axis, opposite sides commuting, which is where
+# nearly all of the saving on random moves is and takes one linear pass.  It then slides a window
+# over the rest, greedily from the left: at each position the longest-saving window starting there
+# is replaced by a shortest move list for its permutation and the scan backs up far enough to see
+# every window the new moves are in, so a later window that would save more is not looked for.
+#
+# A state is the location of the 20 reference stickers as bytes, which is the whole permutation,
+# so growing a window by one move is one bytes.translate() with the move's inverse:
+# ( A B )^-1 = B^-1 A^-1.  States up to depth - 1 quarter turns map to a shortest move list in a
+# dict.  The ten times as many states at exactly 'depth' are only marked in a bitmap by their
+# hash, and a marked state is confirmed by stepping back one move into the dict, so depth 6 takes
+# about 15MB instead of the 200MB of a dict.  Moves are stored as 2 * side_id + direction.
+#
+
+PEEPHOLE_DEPTH = 6
+PEEPHOLE_WINDOW = 12
+PEEPHOLE_FILTER_BITS = 1 << 25   # about 3% of the states not at 'depth' pass the bitmap
+
+class RubicsPeephole:
+
+  _tables = {}          # depth -> ( { state : moves } up to depth - 1, bitmap of the states at depth )
+  _inverse = None       # move -> translate table of the move's inverse
+
+  # side_id -> the lower side_id of it and its opposite side
+  _AXIS = ( None, CUBE_WHITE, CUBE_WHITE, CUBE_RED, CUBE_GREEN, CUBE_RED, CUBE_GREEN )
+
+  def __init__( self, depth_P = PEEPHOLE_DEPTH, window_P = PEEPHOLE_WINDOW ) :
+    RubicsPeephole._tables_init( depth_P )
+
+    self._table, self._filter = RubicsPeephole._tables[ depth_P ]
+    self._depth = depth_P
+    self._window = window_P
+
+  @staticmethod
+  def _tables_init( depth_P ) :
+    if depth_P in RubicsPeephole._tables :
+      return
+
+    RubicsStickers._tables_init()
+
+    with _TABLES_LOCK :
+      if depth_P not in RubicsPeephole._tables :
+        RubicsPeephole._tables_build( depth_P )
+
+  @staticmethod
+  def _tables_build( depth_P ) :
+    inverse = [ None ] * ( 2 * ( CUBE_BLUE + 1 ))
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      for direction in ( ROTATE_CLOCKWISE, ROTATE_COUNTER ) :
+        move = RubicsStickers._moves[ side_id ][ direction ]
+        table = list( range( 0, 256 ))
+        for loc in range( 0, STICKER_COUNT ) :
+          table[ move[ loc ]] = loc
+
+        inverse[ 2 * side_id + direction ] = bytes( table )
+
+    RubicsPeephole._inverse = tuple( inverse )
+
+    # breadth first, the first list to reach a state is a shortest one
+    solved = bytes( STICKER_REFS )
+    table = { solved : b"" }
+    frontier = [ ( solved, b"" ) ]
+    for depth in range( 0, depth_P - 1 ) :
+      next_frontier = []
+      for state, moves in frontier :
+        for code in range( 2 * CUBE_WHITE, 2 * CUBE_BLUE + 2 ) :
+          # a move right after its own inverse is never shortest
+          if moves and moves[ -1 ] == code ^ 1 :
+            continue
+
+          child = state.translate( inverse[ code ] )
+          if child not in table :
+            table[ child ] = moves + bytes( [ code ] )
+            next_frontier.append( ( child, table[ child ] ))
+
+      frontier = next_frontier
+
+    bitmap = bytearray( PEEPHOLE_FILTER_BITS >> 3 )
+    mask = PEEPHOLE_FILTER_BITS - 1
+    for state, moves in frontier :
+      for code in range( 2 * CUBE_WHITE, 2 * CUBE_BLUE + 2 ) :
+        child = state.translate( inverse[ code ] )
+        if child not in table :
+          bit = hash( child ) & mask
+          bitmap[ bit >> 3 ] |= 1 << ( bit & 7 )
+
+    RubicsPeephole._tables[ depth_P ] = ( table, bytes( bitmap ))
+
+  def _deepest( self, state_P ) :
+    # a shortest list of exactly depth moves for a state the bitmap marks, None when it needs more
+    inverse = RubicsPeephole._inverse
+    for code in range( 2 * CUBE_WHITE, 2 * CUBE_BLUE + 2 ) :
+      moves = self._table.get( state_P.translate( inverse[ code ^ 1 ] ))
+      if moves != None and len( moves ) == self._depth - 1 :
+        return moves + bytes( [ code ] )
+
+    return None
+
+  @staticmethod
+  def _merge( codes_P ) :
+    # merges the quarter turns of each run of moves on one axis into the fewest
+    axis = RubicsPeephole._AXIS
+    runs = []     # [ axis, { side_id : clockwise quarter turns } ]
+    for code in codes_P :
+      side_id = code >> 1
+      turns = 3 if code & 1 else 1
+      if runs and runs[ -1 ][ 0 ] == axis[ side_id ] :
+        sides = runs[ -1 ][ 1 ]
+        sides[ side_id ] = ( sides.get( side_id, 0 ) + turns ) & 3
+        # a run that cancels out lets the run before it meet the next move
+        if not any( sides.values() ) :
+          runs.pop()
+
+      else :
+        runs.append( [ axis[ side_id ], { side_id : turns } ] )
+
+    merged = bytearray()
+    for run_axis, sides in runs :
+      for side_id, turns in sides.items() :
+        clockwise = 2 * side_id + ROTATE_CLOCKWISE
+        if turns == 1 :
+          merged.append( clockwise )
+
+        elif turns == 2 :
+          merged += bytes( [ clockwise, clockwise ] )
+
+        elif turns == 3 :
+          merged.append( 2 * side_id + ROTATE_COUNTER )
+
+    return merged
+
+  def Shorten( self, moves_P ) :
+    # ( shorter moves, moves saved )
+    inverse = RubicsPeephole._inverse
+    get = self._table.get
+    bitmap = self._filter
+    mask = PEEPHOLE_FILTER_BITS - 1
+    solved = bytes( STICKER_REFS )
+    window = self._window
+    depth = self._depth
+
+    codes = RubicsPeephole._merge( [ 2 * side_id + direction for side_id, direction in moves_P ] )
+    i = 0
+    while i < len( codes ) :
+      best_end = -1
+      best_saved = 0
+      best_moves = None
+
+      state = solved
+      for j in range( i, min( len( codes ), i + window )) :
+        state = state.translate( inverse[ codes[ j ]] )
+        moves = get( state )
+        if moves == None :
+          # only a state at exactly depth is left, worth a look when it saves more, and as every
+          # quarter turn is an odd permutation of the corners only with a window of depth's parity
+          if j - i - depth < best_saved or ( j + 1 - i - depth ) & 1 :
+            continue
+
+          bit = hash( state ) & mask
+          if not ( bitmap[ bit >> 3 ] >> ( bit & 7 )) & 1 :
+            continue
+
+          moves = self._deepest( state )
+          if moves == None :
+            continue
+
+        if j + 1 - i - len( moves ) > best_saved :
+          best_end = j
+          best_saved = j + 1 - i - len( moves )
+          best_moves = moves
+
+      if best_moves != None :
+        codes[ i : best_end + 1 ] = best_moves
+        i = max( 0, i - window + 1 )
+
+      else :
+        i += 1
+
+    shorter = [ ( code >> 1, code & 1 ) for code in codes ]
+    return shorter, len( moves_P ) - len( shorter )
+
+def TestPeephole( count_P ) :
+  # random moves and moves followed by their undo, shortened to the same stickers and never longer
+  rnd = random.Random( 0 )
+  peephole = RubicsPeephole()
+
+  failures = 0
+  saved_total = 0
+  elapsed = 0.0
+  for test in range( 0, count_P ) :
+    moves = [ ( rnd.randint( CUBE_WHITE, CUBE_BLUE ), rnd.randint( ROTATE_CLOCKWISE, ROTATE_COUNTER )) for k in range( 0, rnd.randint( 50, 100 )) ]
+    undo = test & 1
+    if undo :
+      moves = moves[ : len( moves ) // 2 ]
+      moves += [ ( side_id, 1 - direction ) for side_id, direction in reversed( moves ) ]
+
+    started = time.perf_counter()
+    shorter, saved = peephole.Shorten( moves )
+    elapsed += time.perf_counter() - started
+    saved_total += saved
+
+    before = STICKER_SOLVED
+    for side_id, direction in moves :
+      before = RubicsStickers.Apply( before, side_id, direction )
+
+    after = STICKER_SOLVED
+    for side_id, direction in shorter :
+      after = RubicsStickers.Apply( after, side_id, direction )
+
+    if before != after or len( shorter ) > len( moves ) or saved != len( moves ) - len( shorter ) or ( undo and shorter ) :
+      print( "\tPEEPHOLE MISMATCH ****************** test %d moves %s" % ( test, moves ))
+      failures += 1
+
+  print( "Peephole: %d move lists, %d moves saved, %.3f ms each, %d mismatches" % ( count_P, saved_total, 1000 * elapsed / count_P, failures ))
+  assert failures == 0
+
+#
+# Differential fuzzing.
+#
+# The legacy RubicsCube is run over random moves in lockstep with FUZZ_REFERENCE, the quarter turns
+# as sticker permutations pinned from the original RotateSide, so a change to the legacy engine
+# itself shows up.  After every move the legacy layers must have no face left relabeled by
+# CUBE_DELAY and must read back as the reference state, and every engine in FUZZ_ENGINES must hold
+# the same stickers.  An engine is a class whose objects start solved and have
+# RotateSide( side_id, direction ) and Stickers(), None when the engine finds itself inconsistent.
+# A mismatch is shrunk to a minimal move list that still shows it, FUZZ_LEGACY naming the legacy
+# engine.  Jobs are seeded, a result can be replayed with Replay( engine, moves ), and RunPool()
+# spreads jobs over processes.
+#
+
+# [ side_id ][ direction ] -> new[ loc ] = old[ move[ loc ]], read off the original RotateSide
+FUZZ_REFERENCE = ( None,
+  ( ( 9, 10, 11, 0, 1, 2, 3, 4, 5, 6, 7, 8, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 30, 31, 24, 25, 26, 27, 28, 29, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47 ),   # WHITE
+    ( 3, 4, 5, 6, 7, 8, 9, 10, 11, 0, 1, 2, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 26, 27, 28, 29, 30, 31, 24, 25, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47 ) ),
+  ( ( 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 15, 16, 17, 18, 19, 20, 21, 22, 23, 12, 13, 14, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 42, 43, 44, 45, 46, 47, 40, 41 ),   # YELLOW
+    ( 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 21, 22, 23, 12, 13, 14, 15, 16, 17, 18, 19, 20, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 46, 47, 40, 41, 42, 43, 44, 45 ) ),
+  ( ( 13, 14, 12, 3, 4, 5, 6, 7, 8, 2, 0, 1, 23, 21, 22, 15, 16, 17, 18, 19, 20, 10, 11, 9, 33, 32, 26, 27, 28, 29, 30, 31, 41, 40, 34, 35, 36, 37, 25, 24, 39, 38, 42, 43, 44, 45, 46, 47 ),   # RED
+    ( 10, 11, 9, 3, 4, 5, 6, 7, 8, 23, 21, 22, 2, 0, 1, 15, 16, 17, 18, 19, 20, 13, 14, 12, 39, 38, 26, 27, 28, 29, 30, 31, 25, 24, 34, 35, 36, 37, 41, 40, 33, 32, 42, 43, 44, 45, 46, 47 ) ),
+  ( ( 5, 3, 4, 16, 17, 15, 6, 7, 8, 9, 10, 11, 1, 2, 0, 14, 12, 13, 18, 19, 20, 21, 22, 23, 24, 25, 34, 35, 28, 29, 30, 31, 26, 27, 42, 43, 36, 37, 38, 39, 40, 41, 32, 33, 44, 45, 46, 47 ),   # GREEN
+    ( 14, 12, 13, 1, 2, 0, 6, 7, 8, 9, 10, 11, 16, 17, 15, 5, 3, 4, 18, 19, 20, 21, 22, 23, 24, 25, 32, 33, 28, 29, 30, 31, 42, 43, 26, 27, 36, 37, 38, 39, 40, 41, 34, 35, 44, 45, 46, 47 ) ),
+  ( ( 0, 1, 2, 8, 6, 7, 19, 20, 18, 9, 10, 11, 12, 13, 14, 4, 5, 3, 17, 15, 16, 21, 22, 23, 24, 25, 26, 27, 37, 36, 30, 31, 32, 33, 29, 28, 45, 44, 38, 39, 40, 41, 42, 43, 35, 34, 46, 47 ),   # ORANGE
+    ( 0, 1, 2, 17, 15, 16, 4, 5, 3, 9, 10, 11, 12, 13, 14, 19, 20, 18, 8, 6, 7, 21, 22, 23, 24, 25, 26, 27, 35, 34, 30, 31, 32, 33, 45, 44, 29, 28, 38, 39, 40, 41, 42, 43, 37, 36, 46, 47 ) ),
+  ( ( 0, 1, 2, 3, 4, 5, 11, 9, 10, 22, 23, 21, 12, 13, 14, 15, 16, 17, 7, 8, 6, 20, 18, 19, 24, 25, 26, 27, 28, 29, 38, 39, 32, 33, 34, 35, 30, 31, 46, 47, 40, 41, 42, 43, 44, 45, 36, 37 ),   # BLUE
+    ( 0, 1, 2, 3, 4, 5, 20, 18, 19, 7, 8, 6, 12, 13, 14, 15, 16, 17, 22, 23, 21, 11, 9, 10, 24, 25, 26, 27, 28, 29, 36, 37, 32, 33, 34, 35, 46, 47, 30, 31, 40, 41, 42, 43, 44, 45, 38, 39 ) ) )
+
+class _FuzzZobristCube:
+  # a RubicsCube keeping its hash up to date, inconsistent when the hash is not that of the state
+
+  def __init__( self ) :
+    self._cube = RubicsCube()
+    self._cube.HashEnable()
+
+  def RotateSide( self, side_id_P, direction_P ) :
+    self._cube.RotateSide( side_id_P, direction_P )
+
+  def Stickers( self ) :
+    stickers = RubicsStickers.FromLayers( self._cube._cube )
+    if self._cube.Hash() != RubicsZobrist.HashStickers( stickers ) :
+      return None
+
+    return stickers
+
+# the stream section adds its encoder and decoder pair
+FUZZ_ENGINES = { "stickers" : RubicsStickers, "zobrist" : _FuzzZobristCube }
+FUZZ_LEGACY = "legacy"
+
+FUZZ_MOVES = 10000
+FUZZ_JOBS = 8
+
+class RubicsFuzz:
+
+  def __init__( self, engines_P = None ) :
+    RubicsStickers._tables_init()
+
+    if engines_P == None :
+      engines_P = list( FUZZ_ENGINES.keys() )
+
+    self._engines = engines_P
+
+  @staticmethod
+  def _legacy_state( cube_P ) :
+    # the legacy layers as stickers, None when a face is still relabeled or a piece is not known
+    layers = cube_P._cube
+    for layer, slot in RubicsStickers._CORNER_SLOTS :
+      if max( layers[ layer ][ slot ][ CUBE_CORNER_FACE_0 : CUBE_CORNER_FACE_2 + 1 ] ) > CUBE_BLUE :
+        return None
+
+    for layer, slot in RubicsStickers._EDGE_SLOTS :
+      if max( layers[ layer ][ slot ][ CUBE_EDGE_FACE_0 : CUBE_EDGE_FACE_1 + 1 ] ) > CUBE_BLUE :
+        return None
+
+    try :
+      return RubicsStickers._from_layers( layers )
+
+    except KeyError :
+      return None
+
+  @staticmethod
+  def _reference( stickers_P, side_id_P, direction_P ) :
+    return tuple( [ stickers_P[ i ] for i in FUZZ_REFERENCE[ side_id_P ][ direction_P ]] )
+
+  def Run( self, seed_P, moves_P ) :
+    rnd = random.Random( seed_P )
+    legacy = RubicsCube()
+    reference = STICKER_SOLVED
+    engines = [ FUZZ_ENGINES[ name ]() for name in self._engines ]
+    moves = []
+
+    for step in range( 0, moves_P ) :
+      side_id = rnd.randrange( CUBE_WHITE, CUBE_BLUE + 1 )
+      direction = rnd.randrange( ROTATE_CLOCKWISE, ROTATE_COUNTER + 1 )
+      moves.append( ( side_id, direction ))
+
+      legacy.RotateSide( side_id, direction )
+      reference = RubicsFuzz._reference( reference, side_id, direction )
+      state = RubicsFuzz._legacy_state( legacy )
+
+      name = None
+      if state != reference :
+        name = FUZZ_LEGACY
+
+      else :
+        for i in range( 0, len( engines )) :
+          engines[ i ].RotateSide( side_id, direction )
+          if engines[ i ].Stickers() != state :
+            name = self._engines[ i ]
+            break
+
+      if name != None :
+        shrunk = self.Shrink( name, moves )
+        LOG.Log( LOG_WARNING, "fuzz mismatch engine %s seed %d step %d shrunk to %d moves", name, seed_P, step, len( shrunk ))
+        return { "seed" : seed_P, "engine" : name, "step" : step, "moves" : shrunk }
+
+    return None
+
+  def Replay( self, name_P, moves_P ) :
+    # index of the first move after which the engine and the legacy cube differ, -1 if none,
+    # for FUZZ_LEGACY the legacy cube and the reference
+    legacy = RubicsCube()
+    reference = STICKER_SOLVED
+    engine = None
+    if name_P != FUZZ_LEGACY :
+      engine = FUZZ_ENGINES[ name_P ]()
+
+    for step in range( 0, len( moves_P )) :
+      side_id, direction = moves_P[ step ]
+      legacy.RotateSide( side_id, direction )
+      state = RubicsFuzz._legacy_state( legacy )
+
+      if engine == None :
+        reference = RubicsFuzz._reference( reference, side_id, direction )
+        if state != reference :
+          return step
+
+      else :
+        engine.RotateSide( side_id, direction )
+        if engine.Stickers() != state :
+          return step
+
+    return -1
+
+  def Shrink( self, name_P, moves_P ) :
+    moves = list( moves_P[ : self.Replay( name_P, moves_P ) + 1 ] )
+
+    # drop ever smaller chunks, then single moves, while the mismatch stays
+    chunk = len( moves ) // 2
+    while chunk >= 1 :
+      start = 0
+      while start < len( moves ) :
+        candidate = moves[ : start ] + moves[ start + chunk : ]
+        step = self.Replay( name_P, candidate )
+        if step >= 0 :
+          moves = candidate[ : step + 1 ]
+
+        else :
+          start += chunk
+
+      chunk //= 2
+
+    return moves
+
+  def RunPool( self, seed_P, moves_P, jobs_P = FUZZ_JOBS, workers_P = None ) :
+    jobs = [ ( self._engines, seed_P + i, moves_P ) for i in range( 0, jobs_P ) ]
+
+    with multiprocessing.Pool( workers_P ) as pool :
+      results = pool.map( _fuzz_worker, jobs )
+
+    return [ result for result in results if result != None ]
+
+def _fuzz_worker( job_P ) :
+  engines, seed, moves = job_P
+  return RubicsFuzz( engines ).Run( seed, moves )
+
+def BenchFuzz( moves_P, jobs_P ) :
+  start = time.perf_counter()
+  mismatches = RubicsFuzz().RunPool( 0, moves_P, jobs_P )
+  elapsed = time.perf_counter() - start
+
+  print( "Fuzz: %d moves in %.3fs, %.0f moves/s, %d mismatches" % ( moves_P * jobs_P, elapsed, moves_P * jobs_P / elapsed, len( mismatches )))
+  for mismatch in mismatches :
+    print( "  engine %s seed %d step %d moves %s" % ( mismatch[ "engine" ], mismatch[ "seed" ], mismatch[ "step" ], mismatch[ "moves" ] ))
+
+#
+# Threads.
+#
+# Cubes keep all their state in the instance and the lazy tables are built once under _TABLES_LOCK,
+# so any number of threads can drive their own cubes in one process and share the tables.  The
+# caches filled as they go take the same lock to write, and RubicsLog counts its samples under
+# its own, so nothing shared relies on the GIL.  The
+# benchmark runs the same jobs on 1 thread and on a pool; on a free-threaded build the pool
+# scales with the cores, on a normal build the GIL keeps it near 1x.
+#
+
+THREADS_JOBS = 8
+THREADS_MOVES = 2000
+
+def _threads_worker( seed_P, moves_P ) :
+  # ( moves applied, both engines back to solved and in lockstep )
+  rnd = random.Random( seed_P )
+  cube = RubicsCube()
+  stickers = RubicsStickers()
+
+  moves = []
+  for step in range( 0, moves_P ) :
+    move = ( rnd.randint( CUBE_WHITE, CUBE_BLUE ), rnd.randint( ROTATE_CLOCKWISE, ROTATE_COUNTER ))
+    cube.RotateSide( move[ 0 ], move[ 1 ] )
+    stickers.RotateSide( move[ 0 ], move[ 1 ] )
+    moves.append( move )
+
+  ok = RubicsStickers.FromLayers( cube._cube ) == stickers.Stickers()
+
+  # the sequence followed by its inverse must come back to solved
+  for side_id, direction in reversed( moves ) :
+    cube.RotateSide( side_id, 1 - direction )
+    stickers.RotateSide( side_id, 1 - direction )
+
+  ok = ok and cube._cube == cube._cube_solved and stickers.IsSolved()
+  return 2 * moves_P, ok
+
+def BenchThreads( threads_P, moves_P ) :
+  RubicsStickers._tables_init()
+
+  gil = "on"
+  if hasattr( sys, "_is_gil_enabled" ) and not sys._is_gil_enabled() :
+    gil = "off"
+
+  base = None
+  for threads in ( 1, threads_P ) :
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor( max_workers = threads ) as pool :
+      results = list( pool.map( _threads_worker, range( 0, threads_P ), [ moves_P ] * threads_P ))
+    elapsed = time.perf_counter() - start
+
+    moves = sum( [ result[ 0 ] for result in results ] )
+    failed = len( [ result for result in results if not result[ 1 ] ] )
+    if base == None :
+      base = elapsed
+
+    print( "Threads: GIL %s, %d threads, %d moves in %.3fs, %.0f moves/s, %.2fx, %d failed" % ( gil, threads, moves, elapsed, moves / elapsed, base / elapsed, failed ))
+
+#
+# Mixing time of random walks.
+#
+# A population of walks starts solved and takes one random step at a time, in vectorized batches
+# of MIXING_BATCH walks.  A step is a quarter turn (MIXING_WALK_QUARTER) or one TestRotateRandom
+# wind (MIXING_WALK_WIND): any side, either direction, 0 to 4 quarter turns.  After every step the
+# population is counted into histograms, and each statistic is turned into a total variation
+# distance from the uniform distribution over the cube group:
+#
+#   corner position   which corner sits at each position, worst position
+#   corner twist      twist at each position, worst position
+#   edge position     which edge sits at each position, worst position
+#   edge flip         flip at each position, worst position
+#   solved pieces     number of pieces home and oriented, against a uniform RubicsRandom sample
+#
+# A uniform sample of the same size gives the noise floor of each statistic.  The recommended
+# scramble length is the first step from which every statistic stays within MIXING_EPSILON of
+# its floor.  Needs numpy.
+#
+
+MIXING_WALK_QUARTER = 0
+MIXING_WALK_WIND = 1
+
+MIXING_WALKS = 1 << 22
+MIXING_STEPS = 80
+MIXING_BATCH = 16384
+MIXING_EPSILON = 0.01
+
+MIXING_STATS = [ "corner position", "corner twist", "edge position", "edge flip", "solved pieces" ]
+
+class RubicsMixing:
+
+  def __init__( self, walks_P = MIXING_WALKS, seed_P = 0, walk_P = MIXING_WALK_WIND ) :
+    if numpy == None :
+      raise ImportError( "RubicsMixing needs numpy" )
+
+    RubicsStickers._tables_init()
+
+    self._walks = walks_P
+    self._seed = seed_P
+    self._random = numpy.random.default_rng( seed_P )
+    self._perms, self._weights = RubicsMixing._steps( walk_P )
+
+    self._curve = None
+    self._floor = None
+    self._recommended = None
+
+  @staticmethod
+  def _steps( walk_P ) :
+    # the distinct permutations one step can make and their probabilities
+    choices = []
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      for direction in ( ROTATE_CLOCKWISE, ROTATE_COUNTER ) :
+        if walk_P == MIXING_WALK_QUARTER :
+          choices.append( ( side_id, direction, 1 ))
+
+        else :
+          for count in range( 0, 4 + 1 ) :
+            choices.append( ( side_id, direction, count ))
+
+    found = {}
+    for side_id, direction, count in choices :
+      s = STICKER_SOLVED
+      for i in range( 0, count ) :
+        s = RubicsStickers.Apply( s, side_id, direction )
+
+      found[ s ] = found.get( s, 0 ) + 1
+
+    perms = list( found.keys() )
+    weights = numpy.array( [ found[ perm ] for perm in perms ], dtype = numpy.float64 ) / len( choices )
+    return numpy.array( perms, dtype = numpy.intp ), weights
+
+  def _step( self, states_P ) :
+    # walks are interchangeable, so drawing how many take each move and dealing the moves out
+    # to a shuffled population is the same as drawing every walk's move on its own
+    rnd = self._random
+    counts = rnd.multinomial( len( states_P ), self._weights )
+    order = rnd.permutation( len( states_P ))
+
+    shuffled = states_P[ order ]
+    states = numpy.empty_like( states_P )
+    a = 0
+    for k in range( 0, len( counts )) :
+      b = a + counts[ k ]
+      states[ a : b ] = shuffled[ a : b ][ :, self._perms[ k ]]
+      a = b
+
+    return states
+
+  @staticmethod
+  def _counts( steps_P ) :
+    # every statistic follows from which sticker is on face 0 of each of the 20 positions
+    return { "stickers" : numpy.zeros( ( steps_P, STICKER_POSITIONS * STICKER_COUNT ), dtype = numpy.int64 ),
+             "solved" : numpy.zeros( ( steps_P, STICKER_POSITIONS + 1 ), dtype = numpy.int64 ) }
+
+  @staticmethod
+  def _count( states_P, counts_P, step_P ) :
+    refs = states_P[ :, STICKER_REFS ]
+
+    keys = refs + numpy.arange( 0, STICKER_POSITIONS * STICKER_COUNT, STICKER_COUNT, dtype = numpy.uint16 )
+    counts_P[ "stickers" ][ step_P ] += numpy.bincount( keys.ravel(), minlength = STICKER_POSITIONS * STICKER_COUNT )
+
+    solved = ( refs == numpy.array( STICKER_REFS, dtype = numpy.uint8 )).sum( axis = 1 )
+    counts_P[ "solved" ][ step_P ] += numpy.bincount( solved, minlength = STICKER_POSITIONS + 1 )
+
+  @staticmethod
+  def _distances( counts_P, step_P, reference_P ) :
+    # corner face 0 holds sticker 3 * piece + twist code, edge face 0 holds 2 * piece + flip
+    joint = counts_P[ "stickers" ][ step_P ].reshape( STICKER_POSITIONS, STICKER_COUNT ).astype( numpy.float64 )
+    joint /= joint.sum( axis = 1 )[ :, None ]
+
+    corner = joint[ : STICKER_CORNERS, : STICKER_EDGE_BASE ].reshape( STICKER_CORNERS, STICKER_CORNERS, 3 )
+    edge = joint[ STICKER_CORNERS :, STICKER_EDGE_BASE : ].reshape( STICKER_EDGES, STICKER_EDGES, 2 )
+
+    distances = []
+    for p in ( corner.sum( axis = 2 ), corner.sum( axis = 1 ), edge.sum( axis = 2 ), edge.sum( axis = 1 )) :
+      distances.append( float( 0.5 * numpy.abs( p - 1.0 / p.shape[ 1 ] ).sum( axis = 1 ).max() ))
+
+    p = counts_P[ "solved" ][ step_P ] / counts_P[ "solved" ][ step_P ].sum()
+    distances.append( float( 0.5 * numpy.abs( p - reference_P ).sum() ))
+    return distances
+
+  def _uniform( self, seed_P ) :
+    # counts of a uniform sample as large as the population
+    generator = RubicsRandom( seed_P )
+    counts = RubicsMixing._counts( 1 )
+    for start in range( 0, self._walks, MIXING_BATCH ) :
+      RubicsMixing._count( generator.StatesArray( min( MIXING_BATCH, self._walks - start )), counts, 0 )
+
+    return counts
+
+  def Run( self, steps_P = MIXING_STEPS ) :
+    counts = RubicsMixing._counts( steps_P + 1 )
+    solved = numpy.tile( numpy.arange( 0, STICKER_COUNT, dtype = numpy.uint8 ), ( MIXING_BATCH, 1 ))
+
+    for start in range( 0, self._walks, MIXING_BATCH ) :
+      states = solved[ : min( MIXING_BATCH, self._walks - start ) ]
+      RubicsMixing._count( states, counts, 0 )
+
+      for step in range( 1, steps_P + 1 ) :
+        states = self._step( states )
+        RubicsMixing._count( states, counts, step )
+
+    # one uniform sample is the reference for solved pieces, a second one measures the noise
+    reference = self._uniform( self._seed + 1 )[ "solved" ][ 0 ]
+    reference = reference / reference.sum()
+
+    self._floor = RubicsMixing._distances( self._uniform( self._seed + 2 ), 0, reference )
+    self._curve = [ RubicsMixing._distances( counts, step, reference ) for step in range( 0, steps_P + 1 ) ]
+
+    self._recommended = None
+    for step in range( steps_P, -1, -1 ) :
+      distances = self._curve[ step ]
+      if any( [ distances[ i ] > self._floor[ i ] + MIXING_EPSILON for i in range( 0, len( MIXING_STATS )) ] ) :
+        break
+
+      self._recommended = step
+
+    return self._recommended
+
+  def Curve( self ) :
+    # step -> distances in MIXING_STATS order
+    return self._curve
+
+  def Floor( self ) :
+    return self._floor
+
+  def Recommended( self ) :
+    # None when the walks never got within MIXING_EPSILON of the floor
+    return self._recommended
+
+def BenchMixing( walks_P, steps_P ) :
+  if numpy == None :
+    print( "Mixing: needs numpy" )
+    return
+
+  mixing = RubicsMixing( walks_P )
+
+  start = time.perf_counter()
+  recommended = mixing.Run( steps_P )
+  elapsed = time.perf_counter() - start
+
+  print( "Mixing: %d walks * %d steps in %.3fs, %.0f walk-steps/s" % ( walks_P, steps_P, elapsed, walks_P * steps_P / elapsed ))
+  print( "  step  " + "  ".join( [ "%15s" % name for name in MIXING_STATS ] ))
+  for step, distances in enumerate( mixing.Curve() ) :
+    print( "  %4d  " % step + "  ".join( [ "%15.4f" % distance for distance in distances ] ))
+
+  print( "  floor " + "  ".join( [ "%15.4f" % distance for distance in mixing.Floor() ] ))
+  print( "  recommended scramble length: %s" % recommended )
+
+MIXING_TEST_WALKS = 4096
+MIXING_TEST_STEPS = 12
+
+# step 0: every walk is solved, so each worst position holds one value with probability 1
+MIXING_TEST_SOLVED = [ 7.0 / 8, 2.0 / 3, 11.0 / 12, 1.0 / 2 ]
+
+def TestMixing() :
+  # the step tables and the solved curve against known values, one quarter turn against the
+  # pieces it has to leave home, and a seeded run against a second one
+  if numpy == None :
+    print( "Mixing: needs numpy" )
+    return
+
+  failures = 0
+  checks = []
+
+  quarter = RubicsMixing( MIXING_TEST_WALKS, 0, MIXING_WALK_QUARTER )
+  checks.append( ( "quarter steps", len( quarter._perms ), 12 ))
+  checks.append( ( "quarter weights", bool(( quarter._weights == 1.0 / 12 ).all() ), True ))
+
+  # 0 and 4 turns are the identity, 1 turn one way is 3 the other way, 2 turns either way are equal
+  perms, weights = RubicsMixing._steps( MIXING_WALK_WIND )
+  identity = [ k for k in range( 0, len( perms )) if tuple( perms[ k ] ) == STICKER_SOLVED ]
+  checks.append( ( "wind steps", len( perms ), 1 + 6 * 3 ))
+  checks.append( ( "wind identity", [ float( weights[ k ] ) for k in identity ], [ 24.0 / 60 ] ))
+
+  # a quarter turn moves 4 corners and 4 edges, the other 12 pieces stay home
+  states = numpy.tile( numpy.arange( 0, STICKER_COUNT, dtype = numpy.uint8 ), ( MIXING_TEST_WALKS, 1 ))
+  counts = RubicsMixing._counts( 1 )
+  RubicsMixing._count( RubicsMixing( MIXING_TEST_WALKS, 1, MIXING_WALK_QUARTER )._step( states ), counts, 0 )
+  checks.append( ( "quarter solved", int( counts[ "solved" ][ 0 ][ STICKER_POSITIONS - 8 ] ), MIXING_TEST_WALKS ))
+
+  quarter.Run( MIXING_TEST_STEPS )
+  curve = quarter.Curve()
+  checks.append( ( "curve steps", len( curve ), MIXING_TEST_STEPS + 1 ))
+  checks.append( ( "floor stats", len( quarter.Floor() ), len( MIXING_STATS )))
+  checks.append( ( "curve solved", [ round( distance, 12 ) for distance in curve[ 0 ][ : 4 ] ], [ round( distance, 12 ) for distance in MIXING_TEST_SOLVED ] ))
+  checks.append( ( "curve solved pieces", curve[ 0 ][ 4 ] > 0.99, True ))
+  checks.append( ( "curve falls", [ curve[ -1 ][ i ] < curve[ 0 ][ i ] for i in range( 0, len( MIXING_STATS )) ], [ True ] * len( MIXING_STATS )))
+
+  again = RubicsMixing( MIXING_TEST_WALKS, 0, MIXING_WALK_QUARTER )
+  again.Run( MIXING_TEST_STEPS )
+  checks.append( ( "seeded", again.Curve() == curve and again.Floor() == quarter.Floor(), True ))
+
+  for name, found, expected in checks :
+    if found != expected :
+      print( "\tMIXING MISMATCH ****************** %s %r" % ( name, found ))
+      failures += 1
+
+  print( "Mixing: %d checks, %d mismatches" % ( len( checks ), failures ))
+  assert failures == 0
+
+#
+# Delta move stream.
+#
+# A replay is sent as frames instead of whole cubes.  A keyframe carries the sticker on face 0
+# of all 20 positions, which names the piece there and its twist or flip (RubicsStickers.ToRefs).
+# A delta carries the move and the new value of only the 8 positions it changed.  Every frame has
+# a sequence number, and a keyframe follows every keyframe_P deltas so a client that joins late or
+# loses a frame waits for the next keyframe and is back in sync.
+#
+# STREAM_BINARY frames are bytes: kind, 16 bit sequence, then the 20 values of a keyframe, or the
+# move code 2 * side_id + direction and the 8 values.  STREAM_JSON frames are one line each, a key
+# with its sequence in "k", a delta with its sequence in "d":
+#
+#   {"k":0,"p":[0,3,6,...]}
+#   {"d":1,"m":[1,0],"p":[9,0,3,6,30,24,26,28]}
+#
+# Either way the values of a delta are in the order of the positions the move changes, the
+# client knows them from the move (RubicsStream.Changed).
+# A stream starts from stickers_P, a sticker state or a RubicsCube.
+# Frames() is a generator and AsyncFrames() an async generator over a move list or async
+# iterator, Write() sends the frames to a socket or file.  RubicsStreamDecoder is the client side.
+#
+
+STREAM_BINARY = 0
+STREAM_JSON = 1
+
+STREAM_KEYFRAME = 100
+
+STREAM_FRAME_KEY = 0
+STREAM_FRAME_DELTA = 1
+
+STREAM_SEQ_MOD = 1 << 16
+
+STREAM_KEY_SIZE = 3 + STICKER_POSITIONS
+STREAM_DELTA_SIZE = 3 + 1 + 8
+
+class RubicsStream:
+
+  _changed = None       # move code -> positions the move changes
+
+  def __init__( self, format_P = STREAM_BINARY, keyframe_P = STREAM_KEYFRAME, stickers_P = STICKER_SOLVED ) :
+    RubicsStream._tables_init()
+
+    self._format = format_P
+    self._keyframe = keyframe_P
+    if isinstance( stickers_P, RubicsCube ) :
+      stickers_P = RubicsStickers.FromLayers( stickers_P._cube )
+
+    self._s = tuple( stickers_P )
+    self._seq = 0
+    self._since = 0
+
+  @staticmethod
+  def _tables_init() :
+    if RubicsStream._changed != None :
+      return
+
+    RubicsStickers._tables_init()
+
+    with _TABLES_LOCK :
+      if RubicsStream._changed == None :
+        changed = [ None ] * ( 2 * ( CUBE_BLUE + 1 ))
+        for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+          for direction in ( ROTATE_CLOCKWISE, ROTATE_COUNTER ) :
+            move = RubicsStickers._moves[ side_id ][ direction ]
+            changed[ 2 * side_id + direction ] = tuple( [ position for position in range( 0, STICKER_POSITIONS ) if move[ STICKER_REFS[ position ]] != STICKER_REFS[ position ] ] )
+
+        RubicsStream._changed = tuple( changed )
+
+  @staticmethod
+  def Changed( side_id_P, direction_P ) :
+    RubicsStream._tables_init()
+    return RubicsStream._changed[ 2 * side_id_P + direction_P ]
+
+  def _next_seq( self ) :
+    seq = self._seq
+    self._seq = ( self._seq + 1 ) % STREAM_SEQ_MOD
+    return seq
+
+  def Stickers( self ) :
+    return self._s
+
+  def Key( self ) :
+    # a keyframe of the current state, also what a client joining mid stream is sent first
+    self._since = 0
+    seq = self._next_seq()
+    refs = RubicsStickers.ToRefs( self._s )
+
+    if self._format == STREAM_JSON :
+      return json.dumps( { "k" : seq, "p" : refs }, separators = ( ",", ":" )) + "\n"
+
+    return bytes( [ STREAM_FRAME_KEY, seq >> 8, seq & 0xff ] ) + bytes( refs )
+
+  def Move( self, side_id_P, direction_P ) :
+    # the frames one move makes: its delta, and a keyframe when one is due
+    self._s = RubicsStickers.Apply( self._s, side_id_P, direction_P )
+    self._since += 1
+
+    code = 2 * side_id_P + direction_P
+    seq = self._next_seq()
+    positions = RubicsStream._changed[ code ]
+    values = [ self._s[ STICKER_REFS[ position ]] for position in positions ]
+
+    if self._format == STREAM_JSON :
+      frame = json.dumps( { "d" : seq, "m" : [ side_id_P, direction_P ], "p" : values }, separators = ( ",", ":" )) + "\n"
+
+    else :
+      frame = bytes( [ STREAM_FRAME_DELTA, seq >> 8, seq & 0xff, code ] ) + bytes( values )
+
+    if self._since >= self._keyframe :
+      return [ frame, self.Key() ]
+
+    return [ frame ]
+
+  def Frames( self, moves_P ) :
+    yield self.Key()
+
+    for side_id, direction in moves_P :
+      for frame in self.Move( side_id, direction ) :
+        yield frame
+
+  async def AsyncFrames( self, moves_P ) :
+    yield self.Key()
+
+    if hasattr( moves_P, "__aiter__" ) :
+      async for side_id, direction in moves_P :
+        for frame in self.Move( side_id, direction ) :
+          yield frame
+
+    else :
+      for side_id, direction in moves_P :
+        for frame in self.Move( side_id, direction ) :
+          yield frame
+
+  def Write( self, stream_P, moves_P, limit_P = RENDER_BUFFER_LIMIT ) :
+    # at most limit_P bytes or characters wait in memory before they are written
+    buffer = []
+    buffered = 0
+    for frame in self.Frames( moves_P ) :
+      buffer.append( frame )
+      buffered += len( frame )
+
+      if buffered >= limit_P :
+        _render_write( stream_P, buffer[ 0 ][ : 0 ].join( buffer ))
+        buffer = []
+        buffered = 0
+
+    if buffer :
+      _render_write( stream_P, buffer[ 0 ][ : 0 ].join( buffer ))
+
+class RubicsStreamDecoder:
+
+  def __init__( self ) :
+    RubicsStream._tables_init()
+    self._refs = None
+    self._seq = None
+
+  @staticmethod
+  def Split( data_P ) :
+    # the frames of a buffer of whole frames, binary frames are sized by their kind
+    if isinstance( data_P, str ) :
+      for line in data_P.splitlines() :
+        if line :
+          yield line
+
+      return
+
+    i = 0
+    while i < len( data_P ) :
+      size = STREAM_DELTA_SIZE
+      if data_P[ i ] == STREAM_FRAME_KEY :
+        size = STREAM_KEY_SIZE
+
+      yield bytes( data_P[ i : i + size ] )
+      i += size
+
+  def Feed( self, frame_P ) :
+    # -> positions the frame changed, None while out of sync and waiting for a keyframe
+    if isinstance( frame_P, ( bytes, bytearray )) :
+      kind = frame_P[ 0 ]
+      seq = ( frame_P[ 1 ] << 8 ) | frame_P[ 2 ]
+      if kind == STREAM_FRAME_KEY :
+        values = list( frame_P[ 3 : ] )
+
+      else :
+        positions = RubicsStream._changed[ frame_P[ 3 ]]
+        values = frame_P[ 4 : ]
+
+    else :
+      frame = json.loads( frame_P )
+      values = frame[ "p" ]
+      if "k" in frame :
+        kind = STREAM_FRAME_KEY
+        seq = frame[ "k" ]
+
+      else :
+        kind = STREAM_FRAME_DELTA
+        seq = frame[ "d" ]
+        positions = RubicsStream._changed[ 2 * frame[ "m" ][ 0 ] + frame[ "m" ][ 1 ]]
+
+    if kind == STREAM_FRAME_KEY :
+      self._refs = values
+      self._seq = seq
+      return range( 0, STICKER_POSITIONS )
+
+    if self._refs == None or seq != ( self._seq + 1 ) % STREAM_SEQ_MOD :
+      self._refs = None
+      return None
+
+    self._seq = seq
+    refs = self._refs
+    for i in range( 0, len( positions )) :
+      refs[ positions[ i ]] = values[ i ]
+
+    return positions
+
+  def InSync( self ) :
+    return self._refs != None
+
+  def Stickers( self ) :
+    if self._refs == None :
+      return None
+
+    return RubicsStickers.FromRefs( self._refs )
+
+class _FuzzStream:
+  # every move goes out as frames and is read back by a decoder
+
+  _format = STREAM_BINARY
+
+  def __init__( self ) :
+    self._stream = RubicsStream( self._format )
+    self._decoder = RubicsStreamDecoder()
+    self._decoder.Feed( self._stream.Key() )
+
+  def RotateSide( self, side_id_P, direction_P ) :
+    for frame in self._stream.Move( side_id_P, direction_P ) :
+      self._decoder.Feed( frame )
+
+  def Stickers( self ) :
+    return self._decoder.Stickers()
+
+class _FuzzStreamJson( _FuzzStream ) :
+
+  _format = STREAM_JSON
+
+FUZZ_ENGINES[ "stream" ] = _FuzzStream
+FUZZ_ENGINES[ "stream_json" ] = _FuzzStreamJson
+
+def BenchStream( moves_P ) :
+  rnd = random.Random( 0 )
+  moves = [ ( rnd.randint( CUBE_WHITE, CUBE_BLUE ), rnd.randint( ROTATE_CLOCKWISE, ROTATE_COUNTER )) for i in range( 0, moves_P ) ]
+
+  # what is shipped today: the three layers after every move, as DebugCube prints them
+  cube = RubicsCube()
+  full = 0
+  for side_id, direction in moves :
+    cube.RotateSide( side_id, direction )
+    full += len( "top:, %s\nmid:, %s\nbot:, %s\n" % ( cube._cube[ CUBE_TOP ], cube._cube[ CUBE_MIDDLE ], cube._cube[ CUBE_BOTTOM ] ))
+
+  print( "Stream: layers  %8d bytes, %6.1f bytes/move" % ( full, full / moves_P ))
+
+  for name, format in ( ( "json", STREAM_JSON ), ( "binary", STREAM_BINARY )) :
+    start = time.perf_counter()
+    frames = list( RubicsStream( format ).Frames( moves ))
+    encode = time.perf_counter() - start
+    size = sum( [ len( frame ) for frame in frames ] )
+
+    decoder = RubicsStreamDecoder()
+    start = time.perf_counter()
+    for frame in frames :
+      decoder.Feed( frame )
+
+    decode = time.perf_counter() - start
+
+    state = STICKER_SOLVED
+    for side_id, direction in moves :
+      state = RubicsStickers.Apply( state, side_id, direction )
+
+    print( "Stream: %-7s %8d bytes, %6.1f bytes/move, %5.1fx smaller, encode %.0f moves/s, decode %.0f frames/s, %s" % ( name, size, size / moves_P, full / size, moves_P / encode, len( frames ) / decode, "ok" if decoder.Stickers() == state else "MISMATCH" ))
+
+#
+# 2x2x2 mode.
+#
+# The 8 corner pieces of RubicsCube, without edges and centers, are a 2x2x2 cube.  The corner YBO
+# is held still, which leaves the turns of the 3 faces away from it, WHITE, RED and GREEN, and
+# 7! * 3^6 = 3674160 states.  A state is ranked as the Lehmer rank of the other 7 corners times
+# 3^6 plus the twists of the first 6 of them, in base 3.
+#
+# Build() runs a breadth first search over all states from the ranks alone, the frontier split
+# across POCKET_JOBS threads, and keeps each distance mod 3 in 2 bits, 4 states a byte, about
+# 900 KB.  Save() writes it to a file that Load() maps read-only, and a pocket used before either
+# raises RuntimeError, as does a RubicsSolver given one.  Distances mod 3 are enough to
+# walk downhill: every quarter turn changes the distance by one, so the neighbour one step closer
+# is the one at ( d - 1 ) mod 3, and the walk is an optimal solution in the quarter turn metric.
+#
+# Any cube is first turned as a whole, x = RED ORANGE', y = WHITE YELLOW', z = GREEN BLUE', so
+# YBO comes home, and the moves found are turned back onto the faces of the cube as it lies.
+# Solved means every face one color.
+#
+
+POCKET_STATES = 3674160
+POCKET_TWISTS = 729
+
+POCKET_UNSEEN = 3
+
+POCKET_JOBS = 4
+
+POCKET_MAGIC = b"RUBICS222\n"
+POCKET_FILE = "rubic.pocket"
+
+POCKET_BENCH_QUERIES = 1000000
+
+# states at each quarter turn distance, the 2x2x2 is at most 14 quarter turns (11 half turn metric)
+POCKET_DEPTHS = [ 1, 6, 27, 120, 534, 2256, 8969, 33058, 114149, 360508, 930588, 1350852, 782536, 90280, 276 ]
+
+class RubicsPocket:
+
+  _tables = None
+
+  _fixed = None         # corner position of YBO
+  _others = None        # the other 7 positions, in rank order
+  _moves = None         # move code -> ( side_id, direction ), turns of the faces away from YBO
+  _perm_move = None     # perm rank -> move code -> perm rank
+  _twist_move = None    # twist rank -> move code -> twist rank
+  _rotations = None     # the 24 whole cube turns on the 24 corner locations
+  _conjugate = None     # rotation -> move code -> ( side_id, direction ) of the same turn on the cube as it lies
+  _solved = None        # rank of the solved state
+
+  def __init__( self ) :
+    RubicsPocket._tables_init()
+    self._table = None
+    self._mmap = None
+    self._counts = None
+
+  @staticmethod
+  def _tables_init() :
+    if RubicsPocket._tables != None :
+      return
+
+    RubicsStickers._tables_init()
+
+    with _TABLES_LOCK :
+      if RubicsPocket._tables == None :
+        RubicsPocket._tables_build()
+
+  @staticmethod
+  def _apply( corners_P, move_P ) :
+    return tuple( [ corners_P[ i ] for i in move_P ] )
+
+  @staticmethod
+  def _compose( a_P, b_P ) :
+    return tuple( [ a_P[ i ] for i in b_P ] )
+
+  @staticmethod
+  def _tables_build() :
+    corner_count = 3 * STICKER_CORNERS
+    solved = tuple( range( 0, corner_count ))
+
+    fixed = None
+    for k in range( 0, STICKER_CORNERS ) :
+      layer, slot = RubicsStickers._CORNER_SLOTS[ k ]
+      if RubicsStickers._layers[ layer ][ slot ] == RubicsCube._CUBE_YBO :
+        fixed = k
+
+    faces = {}
+    moves = []
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      for direction in ( ROTATE_CLOCKWISE, ROTATE_COUNTER ) :
+        move = RubicsStickers._moves[ side_id ][ direction ][ : corner_count ]
+        faces[ move ] = ( side_id, direction )
+        if move[ 3 * fixed ] == 3 * fixed :
+          moves.append( ( side_id, direction ))
+
+    RubicsPocket._fixed = fixed
+    RubicsPocket._others = tuple( [ k for k in range( 0, STICKER_CORNERS ) if k != fixed ] )
+    RubicsPocket._moves = tuple( moves )
+
+    perm_move = []
+    for rank in range( 0, math.factorial( STICKER_CORNERS - 1 )) :
+      corners = RubicsPocket._corners( RubicsPocket._perm_unrank( rank ), [ 0 ] * STICKER_CORNERS )
+      perm_move.append( tuple( [ RubicsPocket._perm_rank( RubicsPocket._cubies( RubicsPocket._apply( corners, RubicsStickers._moves[ side_id ][ direction ][ : corner_count ] ))[ 0 ] ) for side_id, direction in moves ] ))
+
+    twist_move = []
+    for rank in range( 0, POCKET_TWISTS ) :
+      corners = RubicsPocket._corners( list( range( 0, STICKER_CORNERS )), RubicsPocket._twist_unrank( rank ))
+      twist_move.append( tuple( [ RubicsPocket._twist_rank( RubicsPocket._cubies( RubicsPocket._apply( corners, RubicsStickers._moves[ side_id ][ direction ][ : corner_count ] ))[ 1 ] ) for side_id, direction in moves ] ))
+
+    RubicsPocket._perm_move = tuple( perm_move )
+    RubicsPocket._twist_move = tuple( twist_move )
+
+    # a face turned one way and the opposite face the other way turns the whole cube
+    turns = []
+    for side_id, opposite in ( ( CUBE_RED, CUBE_ORANGE ), ( CUBE_WHITE, CUBE_YELLOW ), ( CUBE_GREEN, CUBE_BLUE ) ) :
+      turns.append( RubicsPocket._apply( RubicsStickers._moves[ side_id ][ ROTATE_CLOCKWISE ][ : corner_count ], RubicsStickers._moves[ opposite ][ ROTATE_COUNTER ][ : corner_count ] ))
+
+    rotations = [ solved ]
+    for rotation in rotations :
+      for turn in turns :
+        child = RubicsPocket._compose( rotation, turn )
+        if child not in rotations :
+          rotations.append( child )
+
+    # a move m found for s * r is the move r * m * r' on s
+    conjugate = []
+    for rotation in rotations :
+      inverse = [ 0 ] * corner_count
+      for loc in range( 0, corner_count ) :
+        inverse[ rotation[ loc ]] = loc
+
+      conjugate.append( tuple( [ faces[ RubicsPocket._compose( RubicsPocket._compose( rotation, RubicsStickers._moves[ side_id ][ direction ][ : corner_count ] ), inverse ) ] for side_id, direction in moves ] ))
+
+    RubicsPocket._rotations = tuple( rotations )
+    RubicsPocket._conjugate = tuple( conjugate )
+    RubicsPocket._solved = RubicsPocket._rank( solved )
+    RubicsPocket._tables = 1
+
+  @staticmethod
+  def _cubies( corners_P ) :
+    cp = [ 0 ] * STICKER_CORNERS
+    co = [ 0 ] * STICKER_CORNERS
+    for k in range( 0, STICKER_CORNERS ) :
+      for j in range( 0, 3 ) :
+        sticker = corners_P[ 3 * k + j ]
+        if sticker % 3 == 0 :
+          cp[ k ] = sticker // 3
+          co[ k ] = j
+
+    return cp, co
+
+  @staticmethod
+  def _corners( cp_P, co_P ) :
+    s = []
+    for k in range( 0, STICKER_CORNERS ) :
+      s.extend( RubicsStickers._corner_stickers[ 3 * cp_P[ k ] + co_P[ k ]] )
+
+    return tuple( s )
+
+  @staticmethod
+  def _perm_rank( cp_P ) :
+    pieces = [ RubicsPocket._others.index( cp_P[ k ] ) for k in RubicsPocket._others ]
+
+    rank = 0
+    for i in range( 0, len( pieces )) :
+      smaller = 0
+      for j in range( i + 1, len( pieces )) :
+        if pieces[ j ] < pieces[ i ] :
+          smaller += 1
+
+      rank = rank * ( len( pieces ) - i ) + smaller
+
+    return rank
+
+  @staticmethod
+  def _perm_unrank( rank_P ) :
+    count = STICKER_CORNERS - 1
+    digits = []
+    for i in range( 1, count + 1 ) :
+      digits.append( rank_P % i )
+      rank_P //= i
+
+    digits.reverse()
+    left = list( range( 0, count ))
+    cp = list( range( 0, STICKER_CORNERS ))
+    for i in range( 0, count ) :
+      cp[ RubicsPocket._others[ i ]] = RubicsPocket._others[ left.pop( digits[ i ] ) ]
+
+    return cp
+
+  @staticmethod
+  def _twist_rank( co_P ) :
+    rank = 0
+    for k in RubicsPocket._others[ : -1 ] :
+      rank = rank * 3 + co_P[ k ]
+
+    return rank
+
+  @staticmethod
+  def _twist_unrank( rank_P ) :
+    co = [ 0 ] * STICKER_CORNERS
+    for k in reversed( RubicsPocket._others[ : -1 ] ) :
+      co[ k ] = rank_P % 3
+      rank_P //= 3
+
+    co[ RubicsPocket._others[ -1 ]] = -sum( co ) % 3
+    return co
+
+  @staticmethod
+  def _rank( corners_P ) :
+    cp, co = RubicsPocket._cubies( corners_P )
+    return RubicsPocket._perm_rank( cp ) * POCKET_TWISTS + RubicsPocket._twist_rank( co )
+
+  @staticmethod
+  def _normal( state_P ) :
+    # ( rank, rotation ) of a cube or its stickers, the rotation brings YBO home
+    if isinstance( state_P, RubicsCube ) :
+      state_P = RubicsStickers.FromLayers( state_P._cube )
+
+    corners = state_P[ : 3 * STICKER_CORNERS ]
+    home = 3 * RubicsPocket._fixed
+    for i in range( 0, len( RubicsPocket._rotations )) :
+      rotation = RubicsPocket._rotations[ i ]
+      if corners[ rotation[ home ]] == home and corners[ rotation[ home + 1 ]] == home + 1 :
+        return RubicsPocket._rank( RubicsPocket._compose( corners, rotation )), i
+
+    raise ValueError( "corners are not a cube state" )
+
+  @staticmethod
+  def _expand( ranks_P, perm_move_P, twist_move_P, distance_P, found_P ) :
+    # marks the unseen children of a slice of the frontier, threads share found_P
+    children = perm_move_P[ ranks_P // POCKET_TWISTS ] * POCKET_TWISTS + twist_move_P[ ranks_P % POCKET_TWISTS ]
+    children = children[ distance_P[ children ] == POCKET_UNSEEN ]
+    found_P[ children ] = True
+
+  def Build( self, jobs_P = POCKET_JOBS ) :
+    if numpy == None :
+      raise ImportError( "RubicsPocket.Build needs numpy" )
+
+    perm_move = numpy.array( RubicsPocket._perm_move, dtype = numpy.int32 )
+    twist_move = numpy.array( RubicsPocket._twist_move, dtype = numpy.int32 )
+
+    distance = numpy.full( POCKET_STATES, POCKET_UNSEEN, dtype = numpy.uint8 )
+    frontier = numpy.array( [ RubicsPocket._solved ], dtype = numpy.int32 )
+    distance[ frontier ] = 0
+
+    counts = [ 1 ]
+    with concurrent.futures.ThreadPoolExecutor( max_workers = jobs_P ) as pool :
+      while True :
+        found = numpy.zeros( POCKET_STATES, dtype = bool )
+        jobs = [ pool.submit( RubicsPocket._expand, chunk, perm_move, twist_move, distance, found ) for chunk in numpy.array_split( frontier, jobs_P ) ]
+        for job in jobs :
+          job.result()
+
+        frontier = numpy.flatnonzero( found ).astype( numpy.int32 )
+        if len( frontier ) == 0 :
+          break
+
+        distance[ frontier ] = len( counts ) % 3
+        counts.append( len( frontier ))
+
+    quads = distance.reshape( -1, 4 )
+    self._table = bytes( quads[ :, 0 ] | ( quads[ :, 1 ] << 2 ) | ( quads[ :, 2 ] << 4 ) | ( quads[ :, 3 ] << 6 ))
+    self._counts = counts
+    return counts
+
+  def _table_check( self ) :
+    if self._table == None :
+      raise RuntimeError( "RubicsPocket has no table, call Build() or Load() first" )
+
+  def Save( self, path_P = POCKET_FILE ) :
+    self._table_check()
+    with open( path_P, "wb" ) as f :
+      f.write( POCKET_MAGIC )
+      f.write( self._table )
+
+  def Load( self, path_P = POCKET_FILE ) :
+    # the table stays in the file, pages are read in as they are touched
+    with open( path_P, "rb" ) as f :
+      self._mmap = mmap.mmap( f.fileno(), 0, access = mmap.ACCESS_READ )
+
+    if self._mmap[ : len( POCKET_MAGIC ) ] != POCKET_MAGIC or len( self._mmap ) != len( POCKET_MAGIC ) + POCKET_STATES // 4 :
+      raise ValueError( "%s is not a 2x2x2 table" % path_P )
+
+    self._table = memoryview( self._mmap )[ len( POCKET_MAGIC ) : ]
+
+  def Counts( self ) :
+    # depth -> states at that depth, after Build()
+    return self._counts
+
+  def _mod( self, rank_P ) :
+    # distance mod 3, the callers check there is a table
+    return ( self._table[ rank_P >> 2 ] >> (( rank_P & 3 ) << 1 )) & 3
+
+  def _walk( self, rank_P ) :
+    # move codes of an optimal solution from a rank
+    perm_move = RubicsPocket._perm_move
+    twist_move = RubicsPocket._twist_move
+    self._table_check()
+
+    perm = rank_P // POCKET_TWISTS
+    twist = rank_P % POCKET_TWISTS
+    mod = self._mod( rank_P )
+    if mod == POCKET_UNSEEN :
+      raise ValueError( "rank %d is not in the table" % rank_P )
+
+    codes = []
+    while perm * POCKET_TWISTS + twist != RubicsPocket._solved :
+      closer = ( mod + 2 ) % 3
+      for code in range( 0, len( RubicsPocket._moves )) :
+        p = perm_move[ perm ][ code ]
+        t = twist_move[ twist ][ code ]
+        if self._mod( p * POCKET_TWISTS + t ) == closer :
+          break
+
+      else :
+        raise ValueError( "table has no way down from rank %d" % ( perm * POCKET_TWISTS + twist ))
+
+      codes.append( code )
+      perm = p
+      twist = t
+      mod = closer
+
+    return codes
+
+  def Solve( self, state_P ) :
+    # RotateSide moves that solve a RubicsCube or sticker state as a 2x2x2, fewest quarter turns
+    rank, rotation = RubicsPocket._normal( state_P )
+    conjugate = RubicsPocket._conjugate[ rotation ]
+    return [ conjugate[ code ] for code in self._walk( rank ) ]
+
+  def Distance( self, state_P ) :
+    rank, rotation = RubicsPocket._normal( state_P )
+    return len( self._walk( rank ))
+
+  def IsSolved( self, state_P ) :
+    rank, rotation = RubicsPocket._normal( state_P )
+    return rank == RubicsPocket._solved
+
+  def Distances( self, ranks_P ) :
+    # optimal distances of many ranks at once, all walks go downhill together
+    if numpy == None :
+      raise ImportError( "RubicsPocket.Distances needs numpy" )
+
+    self._table_check()
+    table = numpy.frombuffer( self._table, dtype = numpy.uint8 )
+    perm_move = numpy.array( RubicsPocket._perm_move, dtype = numpy.int32 )
+    twist_move = numpy.array( RubicsPocket._twist_move, dtype = numpy.int32 )
+
+    ranks = numpy.asarray( ranks_P, dtype = numpy.int64 )
+    distances = numpy.zeros( len( ranks ), dtype = numpy.uint8 )
+
+    live = numpy.nonzero( ranks != RubicsPocket._solved )[ 0 ]
+    current = ranks[ live ]
+    while len( live ) :
+      closer = ((( table[ current >> 2 ] >> (( current & 3 ) << 1 )) & 3 ) + 2 ) % 3
+      perms = current // POCKET_TWISTS
+      twists = current % POCKET_TWISTS
+
+      step = numpy.full( len( live ), -1, dtype = numpy.int64 )
+      for code in range( 0, len( RubicsPocket._moves )) :
+        child = perm_move[ perms, code ].astype( numpy.int64 ) * POCKET_TWISTS + twist_move[ twists, code ]
+        found = ( step < 0 ) & ((( table[ child >> 2 ] >> (( child & 3 ) << 1 )) & 3 ) == closer )
+        step[ found ] = child[ found ]
+
+      stuck = numpy.nonzero( step < 0 )[ 0 ]
+      if len( stuck ) :
+        raise ValueError( "table has no way down from rank %d" % current[ stuck[ 0 ]] )
+
+      distances[ live ] += 1
+      keep = step != RubicsPocket._solved
+      live = live[ keep ]
+      current = step[ keep ]
+
+    return distances
+
+def BenchPocket( path_P = POCKET_FILE, queries_P = POCKET_BENCH_QUERIES ) :
+  pocket = RubicsPocket()
+
+  start = time.perf_counter()
+  counts = pocket.Build()
+  elapsed = time.perf_counter() - start
+  print( "Pocket: %d states in %.3fs, %d bytes, depths %s" % ( sum( counts ), elapsed, POCKET_STATES // 4, counts ))
+  assert sum( counts ) == POCKET_STATES
+  assert counts == POCKET_DEPTHS
+
+  pocket.Save( path_P )
+  pocket = RubicsPocket()
+  pocket.Load( path_P )
+
+  generator = RubicsRandom( 0 )
+  states = [ generator.State() for i in range( 0, 1000 ) ]
+  start = time.perf_counter()
+  lengths = [ len( pocket.Solve( state )) for state in states ]
+  elapsed = time.perf_counter() - start
+  print( "Pocket: %d solves in %.3fs, %.1f us/solve, %.2f moves average" % ( len( states ), elapsed, elapsed / len( states ) * 1e6, sum( lengths ) / len( lengths )))
+  assert max( lengths ) < len( POCKET_DEPTHS )
+
+  if numpy != None :
+    ranks = numpy.random.default_rng( 0 ).integers( 0, POCKET_STATES, queries_P )
+    start = time.perf_counter()
+    distances = pocket.Distances( ranks )
+    elapsed = time.perf_counter() - start
+    print( "Pocket: %d bulk distance queries in %.3fs, %.0f queries/s, %.2f average" % ( queries_P, elapsed, queries_P / elapsed, distances.mean() ))
+
+    # the walks down from every state must count the same depths the search did
+    depths = numpy.bincount( pocket.Distances( numpy.arange( 0, POCKET_STATES )), minlength = len( POCKET_DEPTHS ))
+    print( "Pocket: walked depths %s" % depths.tolist() )
+    assert depths.tolist() == POCKET_DEPTHS
+
+#
+# Anytime solving.
+#
+# RubicsSolver.Solve() takes a cube and a deadline in seconds and returns the best solution it has
+# when the deadline comes, the cancel event is set or the search is done:
+#
+#   history   the cube's recorded moves played back inverted and shortened by RubicsPeephole,
+#             instant when the cube has HistoryEnable()d, a shortcut the method stage is skipped for
+#   method    corners then edges, milliseconds for any cube.  With a RubicsPocket the corner YBO is
+#             brought home and the pocket solves the corners around it, fewest quarter turns.
+#             Without one, or when that does not solve them, the corners are cycled home like the
+#             edges: one slot after the other, the piece that belongs there is sent home by a pure
+#             3-cycle, SOLVE_CORNER_CYCLE or SOLVE_EDGE_CYCLE between a setup that brings the 3
+#             stickers to the ones it cycles and the setup's undo.  A piece in place but twisted or
+#             flipped is cycled out first, the last two together.  The moves are then shortened by
+#             RubicsPeephole, to about 150 quarter turns with a pocket and 230 without.
+#   search    IDA* over the sticker state for anything shorter, bound by bound.  The bound of a
+#             state is the larger of the 2x2x2 distance of its corners from a RubicsPocket table,
+#             when one is given, and its misplaced edges / 4, since a quarter turn moves 4 edges.
+#             States a bound has failed from go to a RubicsTable with a raised bound, but only once
+#             the whole bound is searched without a solution.  Until then a state may have failed
+#             only for the moves its last move rules out, so a bound that finds a solution or is
+#             stopped stores nothing.
+#
+# Every stage looks at the clock and the cancel event, the search every SOLVE_CHECK nodes, where a
+# pocket distance walk the corner cache misses counts as SOLVE_CHECK_WALK nodes since it costs
+# about as much.  The method stage looks between cycles.
+#
+# Each bound searched without a shorter solution proves one more length, so the result is proven
+# optimal when the search gets to one below the best length.  progress_P( event ) is called after
+# every stage, bound and improvement.  The result is a dict:
+#
+#   moves     RotateSide moves, None when nothing was found in time
+#   length    len( moves )
+#   optimal   1 when no shorter solution exists
+#   stopped   SOLVE_DONE, SOLVE_DEADLINE or SOLVE_CANCELLED
+#   nodes     search nodes visited
+#   stages    [ { "name", "seconds", "length" } ] in the order they ran
+#   seconds   total time
+#
+# A call keeps its clock, cancel event, node count and corner distances in a _SolveCall, so one
+# solver may serve several threads at once, except that a RubicsTable is not safe to share between
+# threads: a solver given one must be used by one thread at a time or behind a lock.
+#
+
+SOLVE_DONE = "done"
+SOLVE_DEADLINE = "deadline"
+SOLVE_CANCELLED = "cancelled"
+
+SOLVE_MAX_DEPTH = 20
+SOLVE_CHECK = 128       # nodes between looks at the clock and the cancel event
+SOLVE_CHECK_WALK = 4    # nodes one RubicsPocket.Distance walk counts as
+SOLVE_CACHE = 1 << 16   # corner distances kept before the cache is dropped
+
+SOLVE_OPPOSITE = [ None, CUBE_YELLOW, CUBE_WHITE, CUBE_ORANGE, CUBE_BLUE, CUBE_RED, CUBE_GREEN ]
+
+# R' F R' B2 R F' R' B2 R2 with U WHITE, R BLUE, F RED, B ORANGE, 3 corners and nothing else
+SOLVE_CORNER_CYCLE = [ ( CUBE_BLUE, ROTATE_COUNTER ), ( CUBE_RED, ROTATE_CLOCKWISE ), ( CUBE_BLUE, ROTATE_COUNTER ), ( CUBE_ORANGE, ROTATE_CLOCKWISE ), ( CUBE_ORANGE, ROTATE_CLOCKWISE ), ( CUBE_BLUE, ROTATE_CLOCKWISE ),
+                       ( CUBE_RED, ROTATE_COUNTER ), ( CUBE_BLUE, ROTATE_COUNTER ), ( CUBE_ORANGE, ROTATE_CLOCKWISE ), ( CUBE_ORANGE, ROTATE_CLOCKWISE ), ( CUBE_BLUE, ROTATE_CLOCKWISE ), ( CUBE_BLUE, ROTATE_CLOCKWISE ) ]
+
+# R U' R U R U R U' R' U' R2, 3 edges and nothing else
+SOLVE_EDGE_CYCLE = [ ( CUBE_BLUE, ROTATE_CLOCKWISE ), ( CUBE_WHITE, ROTATE_COUNTER ), ( CUBE_BLUE, ROTATE_CLOCKWISE ), ( CUBE_WHITE, ROTATE_CLOCKWISE ), ( CUBE_BLUE, ROTATE_CLOCKWISE ), ( CUBE_WHITE, ROTATE_CLOCKWISE ),
+                     ( CUBE_BLUE, ROTATE_CLOCKWISE ), ( CUBE_WHITE, ROTATE_COUNTER ), ( CUBE_BLUE, ROTATE_COUNTER ), ( CUBE_WHITE, ROTATE_COUNTER ), ( CUBE_BLUE, ROTATE_CLOCKWISE ), ( CUBE_BLUE, ROTATE_CLOCKWISE ) ]
+
+class _SolveStop( Exception ) :
+  pass
+
+class _SolveCall:
+  # what one Solve() call changes as it goes
+
+  def __init__( self, deadline_P, cancel_P ) :
+    self._deadline = deadline_P
+    self._cancel = cancel_P
+    self._nodes = 0
+    self._work = 0        # nodes and walks since the last look at the clock
+    self._corners = {}
+
+    # the states the current bound failed from and the moves they had left
+    self._failed = array.array( "Q" )
+    self._failed_left = bytearray()
+
+class RubicsSolver:
+
+  _travel = None          # move code -> loc -> where the move takes the sticker at loc
+  _corner_cycle = None    # ( SOLVE_CORNER_CYCLE codes, { ( x, y, z ) : moves from its 3 stickers to x, y, z } )
+  _edge_cycle = None      # the same for SOLVE_EDGE_CYCLE
+
+  def __init__( self, pocket_P = None, table_P = None ) :
+    RubicsZobrist._tables_init()
+    RubicsSolver._tables_init()
+    if pocket_P != None :
+      pocket_P._table_check()
+
+    self._pocket = pocket_P
+    self._table = table_P
+    self._peephole = RubicsPeephole()
+
+  @staticmethod
+  def _tables_init() :
+    if RubicsSolver._travel != None :
+      return
+
+    RubicsStickers._tables_init()
+
+    with _TABLES_LOCK :
+      if RubicsSolver._travel == None :
+        RubicsSolver._tables_build()
+
+  @staticmethod
+  def _tables_build() :
+    travel = [ None ] * ( 2 * ( CUBE_BLUE + 1 ))
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      for direction in ( ROTATE_CLOCKWISE, ROTATE_COUNTER ) :
+        move = RubicsStickers._moves[ side_id ][ direction ]
+        to = [ 0 ] * STICKER_COUNT
+        for loc in range( 0, STICKER_COUNT ) :
+          to[ move[ loc ]] = loc
+
+        travel[ 2 * side_id + direction ] = tuple( to )
+
+    RubicsSolver._corner_cycle = RubicsSolver._cycle_build( travel, SOLVE_CORNER_CYCLE )
+    RubicsSolver._edge_cycle = RubicsSolver._cycle_build( travel, SOLVE_EDGE_CYCLE )
+    RubicsSolver._travel = tuple( travel )
+
+  @staticmethod
+  def _cycle_build( travel_P, moves_P ) :
+    # the 3 stickers the moves cycle, and breadth first the moves taking them to any other 3
+    s = STICKER_SOLVED
+    for side_id, direction in moves_P :
+      s = RubicsStickers.Apply( s, side_id, direction )
+
+    cycle = [ min( [ loc for loc in range( 0, STICKER_COUNT ) if s[ loc ] != loc ] ) ]
+    while len( cycle ) < 3 :
+      cycle.append( s.index( cycle[ -1 ] ))
+
+    setups = {}
+    frontier = []
+    for i in range( 0, 3 ) :
+      stickers = tuple( cycle[ i : ] + cycle[ : i ] )
+      setups[ stickers ] = b""
+      frontier.append( stickers )
+
+    while frontier :
+      next_frontier = []
+      for stickers in frontier :
+        for code in range( 2 * CUBE_WHITE, 2 * CUBE_BLUE + 2 ) :
+          to = travel_P[ code ]
+          child = ( to[ stickers[ 0 ]], to[ stickers[ 1 ]], to[ stickers[ 2 ]] )
+          if child not in setups :
+            setups[ child ] = setups[ stickers ] + bytes( [ code ] )
+            next_frontier.append( child )
+
+      frontier = next_frontier
+
+    return ( bytes( [ 2 * side_id + direction for side_id, direction in moves_P ] ), setups )
+
+  @staticmethod
+  def _play( stickers_P, codes_P, moves_P ) :
+    codes_P += moves_P
+    for code in moves_P :
+      stickers_P = RubicsStickers.Apply( stickers_P, code >> 1, code & 1 )
+
+    return stickers_P
+
+  @staticmethod
+  def _cycle( stickers_P, codes_P, cycle_P, x_P, y_P, z_P ) :
+    # sends the sticker at x_P to y_P, the one at y_P to z_P and the one at z_P to x_P
+    base, setups = cycle_P
+    back = setups[ ( x_P, y_P, z_P ) ]
+    setup = bytes( [ code ^ 1 for code in reversed( back ) ] )
+    return RubicsSolver._play( stickers_P, codes_P, setup + base + back )
+
+  @staticmethod
+  def _place( call_P, stickers_P, codes_P, cycle_P, base_P, size_P, count_P ) :
+    # the count_P pieces of size_P stickers from location base_P cycled home slot by slot
+    homes = [ base_P + size_P * slot for slot in range( 0, count_P ) ]
+    last = count_P - 1
+
+    slot = 0
+    while slot <= last :
+      RubicsSolver._stop( call_P )
+      home = homes[ slot ]
+      loc = stickers_P.index( home )
+      if loc == home :
+        slot += 1
+        continue
+
+      at = ( loc - base_P ) // size_P
+      if slot == last or ( slot == last - 1 and at == last ) :
+        raise ValueError( "the cube cannot be solved, a piece is twisted, flipped or swapped" )
+
+      if at == slot and slot == last - 1 :
+        # the last two are twisted or flipped, a solved piece helps out and ends up solved
+        stickers_P = RubicsSolver._cycle( stickers_P, codes_P, cycle_P, home, homes[ last ], homes[ 0 ] )
+        loc = stickers_P.index( home )
+        stickers_P = RubicsSolver._cycle( stickers_P, codes_P, cycle_P, loc, home, homes[ 0 ] )
+
+      elif at == slot :
+        stickers_P = RubicsSolver._cycle( stickers_P, codes_P, cycle_P, home, homes[ slot + 1 ], homes[ slot + 2 ] )
+
+      else :
+        # the piece pushed out of the slot goes home too when it can, else where the setup is shortest
+        target = stickers_P[ home ]
+        if ( target - base_P ) // size_P in ( slot, at ) :
+          setups = cycle_P[ 1 ]
+          target = min( [ other for other in range( homes[ slot + 1 ], base_P + size_P * count_P ) if ( other - base_P ) // size_P != at ], key = lambda other : len( setups[ ( loc, home, other ) ] ))
+
+        stickers_P = RubicsSolver._cycle( stickers_P, codes_P, cycle_P, loc, home, target )
+
+    return stickers_P
+
+  def _method( self, call_P, stickers_P ) :
+    # RotateSide moves that solve the stickers, corners then edges
+    codes = bytearray()
+    stickers = stickers_P
+
+    if self._pocket != None :
+      # the fewest moves bringing YBO home, breadth first over where its sticker can go
+      home = 3 * RubicsPocket._fixed
+      paths = { stickers.index( home ) : b"" }
+      frontier = list( paths.keys() )
+      while home not in paths :
+        next_frontier = []
+        for loc in frontier :
+          for code in range( 2 * CUBE_WHITE, 2 * CUBE_BLUE + 2 ) :
+            to = RubicsSolver._travel[ code ][ loc ]
+            if to not in paths :
+              paths[ to ] = paths[ loc ] + bytes( [ code ] )
+              next_frontier.append( to )
+
+        frontier = next_frontier
+
+      stickers = RubicsSolver._play( stickers, codes, paths[ home ] )
+      RubicsSolver._stop( call_P )
+      moves = self._pocket.Solve( stickers )
+      stickers = RubicsSolver._play( stickers, codes, bytes( [ 2 * side_id + direction for side_id, direction in moves ] ))
+
+    if stickers[ : 3 * STICKER_CORNERS ] != STICKER_SOLVED[ : 3 * STICKER_CORNERS ] :
+      # a quarter turn swaps 4 corners in a cycle, an odd permutation the 3-cycles cannot undo
+      cp = [ stickers[ 3 * slot ] // 3 for slot in range( 0, STICKER_CORNERS ) ]
+      if _permutation_parity( cp ) :
+        stickers = RubicsSolver._play( stickers, codes, bytes( [ 2 * CUBE_WHITE + ROTATE_CLOCKWISE ] ))
+
+      stickers = RubicsSolver._place( call_P, stickers, codes, RubicsSolver._corner_cycle, 0, 3, STICKER_CORNERS )
+
+    stickers = RubicsSolver._place( call_P, stickers, codes, RubicsSolver._edge_cycle, STICKER_EDGE_BASE, 2, STICKER_EDGES )
+
+    RubicsSolver._stop( call_P )
+    moves, saved = self._peephole.Shorten( [ ( code >> 1, code & 1 ) for code in codes ] )
+    return moves
+
+  def _corner_bound( self, call_P, stickers_P ) :
+    corners = stickers_P[ : 3 * STICKER_CORNERS ]
+    bound = call_P._corners.get( corners )
+    if bound == None :
+      if len( call_P._corners ) >= SOLVE_CACHE :
+        call_P._corners = {}
+
+      bound = self._pocket.Distance( corners )
+      call_P._corners[ corners ] = bound
+      call_P._work += SOLVE_CHECK_WALK
+
+    return bound
+
+  def _bound( self, call_P, stickers_P ) :
+    edges = 0
+    for loc in STICKER_REFS[ STICKER_CORNERS : ] :
+      if stickers_P[ loc ] != loc :
+        edges += 1
+
+    bound = ( edges + 3 ) // 4
+    if self._pocket != None :
+      return max( bound, self._corner_bound( call_P, stickers_P ))
+
+    corners = 0
+    for loc in STICKER_REFS[ : STICKER_CORNERS ] :
+      if stickers_P[ loc ] != loc :
+        corners += 1
+
+    return max( bound, ( corners + 3 ) // 4 )
+
+  @staticmethod
+  def _stop( call_P ) :
+    if call_P._cancel != None and call_P._cancel.is_set() :
+      raise _SolveStop( SOLVE_CANCELLED )
+
+    if time.perf_counter() >= call_P._deadline :
+      raise _SolveStop( SOLVE_DEADLINE )
+
+  def _check( self, call_P ) :
+    call_P._nodes += 1
+    call_P._work += 1
+    if call_P._work >= SOLVE_CHECK :
+      call_P._work = 0
+      RubicsSolver._stop( call_P )
+
+  def _search( self, call_P, stickers_P, hash_P, depth_P, bound_P, path_P ) :
+    # 1 when a solution of exactly bound_P moves was found along path_P
+    self._check( call_P )
+
+    if stickers_P == STICKER_SOLVED :
+      return 1
+
+    left = bound_P - depth_P
+    if self._bound( call_P, stickers_P ) > left :
+      return 0
+
+    if self._table != None and self._table.Probe( hash_P ) > left :
+      return 0
+
+    last = None
+    if path_P :
+      last = path_P[ -1 ]
+
+    for side_id in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      # opposite faces commute, take them in one order only
+      if last != None and last[ 0 ] == SOLVE_OPPOSITE[ side_id ] and side_id < last[ 0 ] :
+        continue
+
+      for direction in ( ROTATE_CLOCKWISE, ROTATE_COUNTER ) :
+        if last != None and last[ 0 ] == side_id :
+          # undoing the last move, or three quarter turns that are one
+          if last[ 1 ] != direction :
+            continue
+
+          if len( path_P ) >= 2 and path_P[ -2 ] == last :
+            continue
+
+        h, s = RubicsZobrist.MoveStickers( hash_P, stickers_P, side_id, direction )
+        path_P.append( ( side_id, direction ))
+        if self._search( call_P, s, h, depth_P + 1, bound_P, path_P ) :
+          return 1
+
+        path_P.pop()
+
+    if self._table != None and len( call_P._failed ) < self._table._size :
+      call_P._failed.append( hash_P )
+      call_P._failed_left.append( left )
+
+    return 0
+
+  def _store( self, call_P ) :
+    # the bound failed as a whole, so no state it failed from is solved in the moves it had left
+    if self._table != None :
+      for i in range( 0, len( call_P._failed )) :
+        left = call_P._failed_left[ i ]
+        self._table.Store( call_P._failed[ i ], left, left + 1 )
+
+    call_P._failed = array.array( "Q" )
+    call_P._failed_left = bytearray()
+
+  def _stage( self, call_P, result_P, name_P, start_P, progress_P ) :
+    stage = { "name" : name_P, "seconds" : time.perf_counter() - start_P, "length" : result_P[ "length" ] }
+    result_P[ "stages" ].append( stage )
+    if progress_P != None :
+      progress_P( { "stage" : name_P, "length" : result_P[ "length" ], "optimal" : result_P[ "optimal" ], "nodes" : call_P._nodes, "seconds" : stage[ "seconds" ] } )
+
+  def Solve( self, cube_P, deadline_P, cancel_P = None, progress_P = None ) :
+    begin = time.perf_counter()
+    call = _SolveCall( begin + deadline_P, cancel_P )
+
+    stickers = RubicsStickers.FromLayers( cube_P._cube )
+    result = { "moves" : None, "length" : None, "optimal" : 0, "stopped" : SOLVE_DONE, "nodes" : 0, "stages" : [], "seconds" : 0.0 }
+
+    name = None
+    start = begin
+    try :
+      # stage 1, the history played back
+      history = cube_P.History()
+      if history != None :
+        name = "history"
+        start = time.perf_counter()
+        RubicsSolver._stop( call )
+        moves = [ ( side_id, 1 - direction ) for side_id, direction in reversed( history ) ]
+        moves, saved = self._peephole.Shorten( moves )
+
+        s = stickers
+        for side_id, direction in moves :
+          s = RubicsStickers.Apply( s, side_id, direction )
+
+        if s == STICKER_SOLVED :
+          result[ "moves" ] = moves
+          result[ "length" ] = len( moves )
+
+        RubicsSolver._stop( call )
+        self._stage( call, result, name, start, progress_P )
+
+      # stage 2, corners then edges when there was no history to play back
+      if result[ "moves" ] == None :
+        name = "method"
+        start = time.perf_counter()
+        moves = self._method( call, stickers )
+        result[ "moves" ] = moves
+        result[ "length" ] = len( moves )
+        self._stage( call, result, name, start, progress_P )
+
+      # stage 3, shorter solutions until the bound meets the best length
+      name = "search"
+      start = time.perf_counter()
+      bound = self._bound( call, stickers )
+      while 1 :
+        limit = SOLVE_MAX_DEPTH
+        if result[ "length" ] != None :
+          limit = result[ "length" ] - 1
+
+        if bound > limit :
+          if result[ "length" ] != None :
+            result[ "optimal" ] = 1
+          break
+
+        path = []
+        if self._search( call, stickers, RubicsZobrist.HashStickers( stickers ), 0, bound, path ) :
+          result[ "moves" ] = path
+          result[ "length" ] = len( path )
+          result[ "optimal" ] = 1
+          break
+
+        self._store( call )
+        if progress_P != None :
+          progress_P( { "stage" : "search", "bound" : bound, "length" : result[ "length" ], "optimal" : 0, "nodes" : call._nodes, "seconds" : time.perf_counter() - start } )
+
+        bound += 1
+
+      self._stage( call, result, name, start, progress_P )
+
+    except _SolveStop as stop :
+      result[ "stopped" ] = stop.args[ 0 ]
+      if name != None :
+        self._stage( call, result, name, start, progress_P )
+
+    result[ "nodes" ] = call._nodes
+    result[ "seconds" ] = time.perf_counter() - begin
+    return result
+
+def BenchSolve( scramble_P, deadlines_P ) :
+  pocket = RubicsPocket()
+  pocket.Build()
+  solver = RubicsSolver( pocket, RubicsTable())
+
+  rnd = random.Random( 0 )
+  states = RubicsRandom( 0 )
+  for deadline in deadlines_P :
+    # a short scramble the history solves, and a random state with no history
+    scrambled = RubicsCube()
+    scrambled.HistoryEnable()
+    for i in range( 0, scramble_P ) :
+      scrambled.RotateSide( rnd.randint( CUBE_WHITE, CUBE_BLUE ), rnd.randint( ROTATE_CLOCKWISE, ROTATE_COUNTER ))
+
+    state = RubicsCube()
+    state._cube = RubicsStickers.ToLayers( states.State() )
+
+    for name, cube in ( ( "%d moves scrambled" % scramble_P, scrambled ), ( "random state", state ) ) :
+      result = solver.Solve( cube, deadline )
+
+      s = RubicsStickers.FromLayers( cube._cube )
+      for side_id, direction in result[ "moves" ] or [] :
+        s = RubicsStickers.Apply( s, side_id, direction )
+
+      if result[ "moves" ] == None or s != STICKER_SOLVED :
+        print( "\tSOLVE FAILED ****************** deadline %.3fs, %s" % ( deadline, name ))
+
+      stages = ", ".join( [ "%s %.3fs %s" % ( stage[ "name" ], stage[ "seconds" ], stage[ "length" ] ) for stage in result[ "stages" ] ] )
+      print( "Solve: deadline %.3fs, %s, %s moves, optimal %d, stopped %s, %d nodes in %.3fs (%s)" % ( deadline, name, result[ "length" ], result[ "optimal" ], result[ "stopped" ], result[ "nodes" ], result[ "seconds" ], stages ))
+
+if __name__ == "__main__" :
+  cube = RubicsCube()
+
+  print( "BEG TEST {" )
+  cube.PrintCube()
+
+  cube.TestRotate( TEST_ROTATE, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, 1 )
+  cube.TestRotate( TEST_ROTATE, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
+  cube.TestRotate( TEST_ROTATE, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, 3 )
+  cube.TestRotate( TEST_ROTATE, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, 4 )
+  cube.TestRotate( TEST_ROTATE_BACK, "WHITE => ROTATE_CLOCKWISE", CUBE_WHITE, ROTATE_CLOCKWISE, 2 ) # back to solved
+
+  cube.TestRotate( TEST_ROTATE, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, 1 )
+  cube.TestRotate( TEST_ROTATE, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
+  cube.TestRotate( TEST_ROTATE, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, 3 )
+  cube.TestRotate( TEST_ROTATE, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, 4 )
+  cube.TestRotate( TEST_ROTATE_BACK, "YELLOW => ROTATE_CLOCKWISE", CUBE_YELLOW, ROTATE_CLOCKWISE, 2 ) # back to solved
+
+  cube.TestRotate( TEST_ROTATE, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, 1 )
+  cube.TestRotate( TEST_ROTATE, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
+  cube.TestRotate( TEST_ROTATE, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, 3 )
+  cube.TestRotate( TEST_ROTATE, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, 4 )
+  cube.TestRotate( TEST_ROTATE_BACK, "RED => ROTATE_CLOCKWISE", CUBE_RED, ROTATE_CLOCKWISE, 2 ) # back to solved
+
+  cube.TestRotate( TEST_ROTATE, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, 1 )
+  cube.TestRotate( TEST_ROTATE, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
+  cube.TestRotate( TEST_ROTATE, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, 3 )
+  cube.TestRotate( TEST_ROTATE, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, 4 )
+  cube.TestRotate( TEST_ROTATE_BACK, "ORANGE => ROTATE_CLOCKWISE", CUBE_ORANGE, ROTATE_CLOCKWISE, 2 ) # back to solved
+
+  cube.TestRotate( TEST_ROTATE, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, 1 )
+  cube.TestRotate( TEST_ROTATE, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
+  cube.TestRotate( TEST_ROTATE, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, 3 )
+  cube.TestRotate( TEST_ROTATE, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, 4 )
+  cube.TestRotate( TEST_ROTATE_BACK, "GREEN => ROTATE_CLOCKWISE", CUBE_GREEN, ROTATE_CLOCKWISE, 2 ) # back to solved
+
+  cube.TestRotate( TEST_ROTATE, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, 1 )
+  cube.TestRotate( TEST_ROTATE, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, TEST_ROTATE_BACK )
+  cube.TestRotate( TEST_ROTATE, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, 3 )
+  cube.TestRotate( TEST_ROTATE, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, 4 )
+  cube.TestRotate( TEST_ROTATE_BACK, "BLUE => ROTATE_CLOCKWISE", CUBE_BLUE, ROTATE_CLOCKWISE, 2 ) # back to solved
+
+  print( "START OF MUTLI SIDE ROTATIONS" )
+  iterations_total = 0
+  for y in range( 0, TEST_ROTATE_RANDOM_ITERATIONS_1 ) :
+    for x in range( CUBE_WHITE, CUBE_BLUE + 1 ) :
+      iterations = cube.TestRotateRandom() 
+      iterations_total += iterations
+      print( iterations )
+
+  cube.PrintCube()
+  if cube._cube == cube._cube_solved :
+    print( "\tCUBE SOLVED after %d random iterations" % iterations_total )
+  else :
+    print( "\tCUBE UNSOLVED ****************** after %d random iterations" % iterations_total )
+
+  print( "END TEST }" )
+
+  if TEST_RANDOM_STATE == 1 :
+    BenchRandomState( TEST_RANDOM_STATE_COUNT )
+
+  if TEST_LOG == 1 :
+    TestLog()
+
+  if TEST_RENDER == 1 :
+    TestRender()
+
+  if TEST_FACE_VIEW == 1 :
+    TestFaceView()
+
+  if TEST_ALGORITHM == 1 :
+    TestAlgorithm( TEST_ALGORITHM_COUNT, TEST_ALGORITHM_LENGTH )
+
+  if TEST_ZOBRIST == 1 :
+    TestZobrist( TEST_ZOBRIST_MOVES )
+
+  if TEST_FACELETS == 1 :
+    TestFacelets( TEST_FACELETS_COUNT )
+
+  if TEST_PEEPHOLE == 1 :
+    TestPeephole( TEST_PEEPHOLE_COUNT )
+
+  if TEST_FUZZ == 1 :
+    BenchFuzz( FUZZ_MOVES, FUZZ_JOBS )
+
+  if TEST_THREADS == 1 :
+    BenchThreads( THREADS_JOBS, THREADS_MOVES )
+
+  if TEST_MIXING_CHECK == 1 :
+    TestMixing()
+
+  if TEST_MIXING == 1 :
+    BenchMixing( MIXING_WALKS, MIXING_STEPS )
+
+  if TEST_STREAM == 1 :
+    BenchStream( TEST_STREAM_MOVES )
+
+  if TEST_POCKET == 1 :
+    BenchPocket( POCKET_FILE, POCKET_BENCH_QUERIES )
+
+  if TEST_SOLVE == 1 :
+    BenchSolve( TEST_SOLVE_SCRAMBLE, TEST_SOLVE_DEADLINES )